@@ -1,81 +1,529 @@
+import os
+import time
+import inspect
+import threading
+import functools
 import pandas as pd
 from datetime import date
-from sqlalchemy import text
-import streamlit as st
-from database import engine
+from sqlalchemy import text, event
+from database import engine, amount_sql, transaction_columns_sql
+from cache import get_cache
+from calculations import (
+    LEDGER_COLUMNS,
+    ledger_frame,
+    empty_timeline,
+    compute_balance_timeline,
+    monthly_summary,
+    period_series
+)
+from profiling import span, timed, note
+
+
+# ---------------- DATA VERSIONS ----------------
+# Every write bumps the counter of the tables it touched (in the same DB
+# transaction). Cached loaders are keyed on those counters, so they stay
+# valid until their data really changes, in this process or another one.
+DATA_VERSION_POLL_SECONDS = float(os.getenv("DATA_VERSION_POLL_SECONDS", "1"))
+
+# Which database the versions belong to: its URL (no password) and the
+# random "instance" id it got when it was created (migration 10).
+DATABASE_NAME = engine.url.render_as_string(hide_password=True)
+
+_versions_lock = threading.Lock()
+_versions = {"checked_at": None, "values": {}}
+
+
+def get_data_versions():
+    with _versions_lock:
+        checked_at = _versions["checked_at"]
+        if checked_at is not None and time.monotonic() - checked_at < DATA_VERSION_POLL_SECONDS:
+            return dict(_versions["values"])
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT name, version FROM data_versions")).fetchall()
+
+    values = {row[0]: int(row[1]) for row in rows}
+
+    with _versions_lock:
+        _versions["checked_at"] = time.monotonic()
+        _versions["values"] = values
+
+    return dict(values)
+
+
+def bump_data_version(conn, *names, accounts=()):
+    # accounts: ids of the accounts the write touched. Each table also has
+    # one counter per account ("daily_balances@2"), created on first use,
+    # so loaders of one account are not invalidated by writes to another.
+    keys = list(names) + [f"{name}@{int(account_id)}" for account_id in accounts for name in names]
+
+    conn.execute(
+        text("""
+        INSERT INTO data_versions (name, version)
+        VALUES (:name, 1)
+        ON CONFLICT (name) DO UPDATE SET version = data_versions.version + 1
+        """),
+        [{"name": key} for key in keys]
+    )
+    conn.info["data_versions_bumped"] = True
+
+
+@event.listens_for(engine, "commit")
+def _refresh_versions_on_commit(conn):
+    # a local write must be visible to the very next rerun
+    if conn.info.pop("data_versions_bumped", False):
+        with _versions_lock:
+            _versions["checked_at"] = None
+
+
+@event.listens_for(engine, "rollback")
+def _forget_bump_on_rollback(conn):
+    conn.info.pop("data_versions_bumped", None)
+
+
+def _version_name(table, arguments):
+    # "table@arg": the per-account counter of table for the account passed
+    # as `arg`, or the table's own counter when that argument is None
+    if "@" not in table:
+        return table
+
+    table, argument = table.split("@")
+    account_id = arguments[argument]
+    return table if account_id is None else f"{table}@{int(account_id)}"
+
+
+def _cache_key_part(value):
+    # Lists, sets and dicts as tuples: keys must hash and have a stable
+    # repr, so sets are sorted rather than turned into frozensets
+    if isinstance(value, (list, tuple)):
+        return tuple(_cache_key_part(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((_cache_key_part(item) for item in value), key=repr))
+    if isinstance(value, dict):
+        return tuple(sorted((key, _cache_key_part(item)) for key, item in value.items()))
+    return value
+
+
+def versioned_cache(*tables, max_entries=32, shared=False):
+    # Results are cached by the current cache backend (see cache.py) under
+    # the versions of `tables` and the call arguments. A table written as
+    # "table@account_id" is versioned per account (see bump_data_version).
+    # shared: one object for every caller, handed out as a copy-on-write
+    # view instead of a copy.
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        signature = inspect.signature(func)
+        partitioned = any("@" in table for table in tables)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            def compute():
+                note(cache="miss")
+                return func(*args, **kwargs)
+
+            names = tables
+            if partitioned:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                names = [_version_name(table, bound.arguments) for table in tables]
+
+            with span(func.__name__) as record:
+                versions = get_data_versions()
+                key = (
+                    (DATABASE_NAME, versions.get("instance", 0)),
+                    tuple(versions.get(t, 0) for t in names),
+                    _cache_key_part(args),
+                    _cache_key_part(kwargs)
+                )
+                result = get_cache().call(name, key, compute, max_entries, shared)
+
+                record.setdefault("cache", "hit")
+                if hasattr(result, "__len__"):
+                    record["rows"] = len(result)
+
+            if shared and isinstance(result, pd.DataFrame):
+                result = result.copy(deep=False)
+            return result
+
+        return wrapper
+
+    return decorator
 
 
 # ---------------- TRANSACTIONS ----------------
-@st.cache_data(ttl=20)
-def load_transactions():
+TRANSACTION_COLUMNS = ("id", "account_id", "date", "type", "category", "amount", "note")
+
+TRANSACTIONS_PAGE_SIZE = int(os.getenv("TRANSACTIONS_PAGE_SIZE", "50"))
+
+
+@versioned_cache("transactions@account_id", max_entries=64, shared=True)
+def load_transactions(start=None, end=None, columns=None, account_id=None):
+    # The ledger frame (see calculations.py) for [start, end) of one
+    # account (every account when None), parsed once per data version and
+    # shared by all sessions. Each (start, end, columns, account)
+    # combination is cached on its own, so a month view only ever pulls
+    # that month's rows and columns. Notes only when asked for.
+    columns = tuple(columns) if columns else ("type", "category", "amount_cents")
+
+    unknown = set(columns) - set(LEDGER_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown ledger columns: {sorted(unknown)}")
+
+    selected = ["date"] + ["amount" if c == "amount_cents" else c for c in columns]
+
+    params = {}
+    conditions = _account_filter(account_id, params) + _date_range_filter(start, end, params)
+
+    query = f"SELECT {transaction_columns_sql(selected)} FROM transactions"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY date ASC, id ASC"
+
     with engine.connect() as conn:
-        df = pd.read_sql("SELECT * FROM transactions ORDER BY date ASC", conn)
-    return df
+        df = pd.read_sql(text(query), conn, params=params)
+
+    return ledger_frame(df)
+
+
+def transaction_filters(start, end, t_type, category, min_amount, max_amount, params,
+                        account_id=None):
+    conditions = _account_filter(account_id, params) + _date_range_filter(start, end, params)
+
+    if t_type is not None:
+        conditions.append("type = :type")
+        params["type"] = t_type
+    if category is not None:
+        conditions.append("category = :category")
+        params["category"] = category
+    if min_amount is not None:
+        conditions.append(f"{amount_sql()} >= :min_amount")
+        params["min_amount"] = float(min_amount)
+    if max_amount is not None:
+        conditions.append(f"{amount_sql()} <= :max_amount")
+        params["max_amount"] = float(max_amount)
+
+    return conditions
+
+
+@versioned_cache("transactions@account_id", max_entries=64)
+def load_transactions_page(cursor=None, backward=False, page_size=TRANSACTIONS_PAGE_SIZE,
+                           start=None, end=None, t_type=None, category=None,
+                           min_amount=None, max_amount=None, account_id=None):
+    # Keyset pagination on (date, id): the page right after cursor, or right
+    # before it when backward (no cursor: first / last page). Each page is
+    # an index range scan of page_size rows, wherever it is in the ledger.
+    # Returns the rows in ascending order and whether more rows follow in
+    # the direction of travel.
+    params = {"limit": int(page_size) + 1}
+    conditions = transaction_filters(start, end, t_type, category, min_amount, max_amount, params,
+                                     account_id)
+
+    if cursor is not None:
+        conditions.append("(date, id) < (:cursor_date, :cursor_id)" if backward
+                          else "(date, id) > (:cursor_date, :cursor_id)")
+        params["cursor_date"] = str(cursor[0])[:10]
+        params["cursor_id"] = int(cursor[1])
+
+    query = f"SELECT {transaction_columns_sql(TRANSACTION_COLUMNS)} FROM transactions"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY date DESC, id DESC" if backward else " ORDER BY date ASC, id ASC"
+    query += " LIMIT :limit"
+
+    with engine.connect() as conn:
+        df = pd.read_sql(text(query), conn, params=params)
 
+    has_more = len(df) > page_size
+    df = df.iloc[:page_size]
 
-# ---------------- SNAPSHOTS ----------------
-@st.cache_data(ttl=20)
-def load_snapshots():
+    if backward:
+        df = df.iloc[::-1]
+
+    df = df.reset_index(drop=True)
+    df["date"] = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d")
+    df["amount"] = df["amount"].astype(float)
+    return df, has_more
+
+
+@versioned_cache("monthly_rollup")
+def load_categories():
     with engine.connect() as conn:
-        df = pd.read_sql("SELECT * FROM snapshots ORDER BY date ASC", conn)
-    return df
+        rows = conn.execute(text(
+            "SELECT DISTINCT category FROM monthly_rollup ORDER BY category"
+        )).fetchall()
+    return [row[0] for row in rows]
+
+
+# ---------------- ACCOUNTS ----------------
+# Each row of the balance table is an account: a name, the balance it had
+# on the starting date (opening_balance) and its current balance (amount).
+# Account 1 always exists; writes that do not name an account go there.
+# One model everywhere (writes, timelines, snapshots, reconcile.py and the
+# Dashboard): amount = opening_balance + every transaction of the account,
+# whatever its date. Transactions dated before the starting date count
+# from the first day of the timeline.
+DEFAULT_ACCOUNT_ID = 1
+
+
+@versioned_cache("balance")
+def load_accounts():
+    # a handful of rows: built directly, without read_sql's overhead
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT id, name, opening_balance, amount FROM balance ORDER BY id"
+        )).fetchall()
+
+    return pd.DataFrame({
+        "id": [int(row[0]) for row in rows],
+        "name": [row[1] for row in rows],
+        "opening_balance": [float(row[2] or 0) for row in rows],
+        "balance": [float(row[3] or 0) for row in rows],
+    })
+
+
+def account_openings(conn, account_id=None):
+    # {account id: opening balance} of one account or all of them, read on
+    # the caller's connection
+    query = "SELECT id, opening_balance FROM balance"
+    params = {}
+
+    if account_id is not None:
+        query += " WHERE id = :account_id"
+        params["account_id"] = int(account_id)
+
+    rows = conn.execute(text(query + " ORDER BY id"), params).fetchall()
+
+    if account_id is not None and not rows:
+        raise ValueError(f"Unknown account: {account_id}")
+
+    return {int(row[0]): float(row[1] or 0) for row in rows}
 
 
-# ---------------- BALANCE ----------------
-def get_balance():
+def opening_balance(account_id=None):
+    # One account's opening balance, or the sum of all of them
+    accounts = load_accounts()
+    if account_id is not None:
+        accounts = accounts[accounts["id"] == int(account_id)]
+    return float(accounts["opening_balance"].sum())
+
+
+def get_balance(account_id=None):
+    # One account's balance, or the sum of all of them
+    query = "SELECT SUM(amount) FROM balance"
+    params = {}
+
+    if account_id is not None:
+        query += " WHERE id = :account_id"
+        params["account_id"] = int(account_id)
+
     with engine.connect() as conn:
-        row = conn.execute(text("SELECT amount FROM balance WHERE id=1")).fetchone()
-    return float(row[0]) if row else 0.0
+        row = conn.execute(text(query), params).fetchone()
+    return float(row[0]) if row and row[0] is not None else 0.0
 
 
-def set_balance(amount):
-    with engine.begin() as conn:
-        conn.execute(
-            text("UPDATE balance SET amount=:amount WHERE id=1"),
-            {"amount": float(amount)}
-        )
+# ---------------- AGGREGATES ----------------
+# Date ranges are start-inclusive / end-exclusive, like the Dashboard periods.
+def _month_expr():
+    if engine.dialect.name == "sqlite":
+        return "substr(date, 1, 7)"
+    return "to_char(date, 'YYYY-MM')"
 
 
-# ---------------- SNAPSHOT SAVE ----------------
-def save_snapshot():
-    today_str = str(date.today())
-    balance = get_balance()
+def _account_filter(account_id, params):
+    # No account: every account
+    if account_id is None:
+        return []
 
-    with engine.begin() as conn:
-        conn.execute(
-            text("""
-            INSERT INTO snapshots (date, networth)
-            VALUES (:date, :networth)
-            ON CONFLICT (date) DO NOTHING
-            """),
-            {"date": today_str, "networth": float(balance)}
-        )
+    params["account_id"] = int(account_id)
+    return ["account_id = :account_id"]
+
+
+def _date_range_filter(start, end, params):
+    conditions = []
+
+    if start is not None:
+        conditions.append("date >= :start")
+        params["start"] = str(start)
+    if end is not None:
+        conditions.append("date < :end")
+        params["end"] = str(end)
+
+    return conditions
+
+
+@versioned_cache("transactions@account_id")
+def load_type_totals(start=None, end=None, account_id=None):
+    params = {}
+    conditions = _account_filter(account_id, params) + _date_range_filter(start, end, params)
+
+    query = f"SELECT type, {amount_sql('SUM(amount)')} FROM transactions"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " GROUP BY type"
+
+    with engine.connect() as conn:
+        rows = conn.execute(text(query), params).fetchall()
+
+    return {row[0]: float(row[1] or 0) for row in rows}
+
+
+def _month_range(start, end):
+    # Month keys for a range that starts and ends on the 1st of a month,
+    # None when the rollup cannot answer it exactly.
+    if (start is not None and str(start)[8:10] != "01") or \
+            (end is not None and str(end)[8:10] != "01"):
+        return None
 
+    params = {}
+    conditions = []
+
+    if start is not None:
+        conditions.append("month >= :start_month")
+        params["start_month"] = str(start)[:7]
+    if end is not None:
+        conditions.append("month < :end_month")
+        params["end_month"] = str(end)[:7]
+
+    return conditions, params
+
+
+@versioned_cache("transactions@account_id", "monthly_rollup@account_id")
+def load_category_totals(start=None, end=None, t_type="expense", account_id=None):
+    month_range = _month_range(start, end)
+
+    if month_range is not None:
+        conditions, params = month_range
+        table = "monthly_rollup"
+        total = "SUM(amount)"
+    else:
+        params = {}
+        conditions = _date_range_filter(start, end, params)
+        table = "transactions"
+        total = amount_sql("SUM(amount)")
+
+    params["type"] = t_type
+    conditions = ["type = :type"] + _account_filter(account_id, params) + conditions
+
+    query = f"""
+        SELECT category, {total} AS amount
+        FROM {table}
+        WHERE {" AND ".join(conditions)}
+        GROUP BY category
+        ORDER BY amount DESC
+    """
+
+    with engine.connect() as conn:
+        df = pd.read_sql(text(query), conn, params=params)
+
+    df["amount"] = df["amount"].astype(float)
+    return df
+
+
+@versioned_cache("monthly_rollup@account_id")
+def load_monthly_summary(account_id=None):
+    params = {}
+    conditions = _account_filter(account_id, params)
+
+    query = "SELECT month, type, SUM(amount) AS amount FROM monthly_rollup"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " GROUP BY month, type ORDER BY month"
+
+    with engine.connect() as conn:
+        df = pd.read_sql(text(query), conn, params=params)
 
-# ---------------- MONTHLY SUMMARY ----------------
-def monthly_summary(df):
     if df.empty:
         return pd.DataFrame()
 
-    df = df.copy()
-    df["date"] = pd.to_datetime(df["date"])
-    df["month"] = df["date"].dt.to_period("M").astype(str)
+    df["amount"] = df["amount"].astype(float)
+    return df
 
-    grouped = df.groupby(["month", "type"])["amount"].sum().reset_index()
-    grouped = grouped.sort_values("month")
 
-    return grouped
+# ---------------- MONTHLY ROLLUP ----------------
+# monthly_rollup holds sum and count per account, month, type and category. Writers
+# pass the rows they add (sign=1) or remove (sign=-1) on their own
+# connection, so the rollup commits together with the transaction rows.
+@timed()
+def apply_rollup_delta(conn, rows):
+    # rows: iterable of (account_id, date, type, category, amount, sign)
+    deltas = {}
+
+    for account_id, t_date, t_type, category, amount, sign in rows:
+        key = (int(account_id), str(t_date)[:7], t_type, category or "")
+        amount_sum, count = deltas.get(key, (0.0, 0))
+        deltas[key] = (amount_sum + sign * float(amount), count + sign)
+
+    if not deltas:
+        return
+
+    conn.execute(
+        text("""
+        INSERT INTO monthly_rollup (account_id, month, type, category, amount, tx_count)
+        VALUES (:account_id, :month, :type, :category, :amount, :tx_count)
+        ON CONFLICT (account_id, month, type, category) DO UPDATE SET
+            amount = ROUND(monthly_rollup.amount + excluded.amount, 2),
+            tx_count = monthly_rollup.tx_count + excluded.tx_count
+        """),
+        [
+            {"account_id": account_id, "month": month, "type": t_type, "category": category,
+             "amount": round(amount_sum, 2), "tx_count": count}
+            for (account_id, month, t_type, category), (amount_sum, count) in deltas.items()
+        ]
+    )
+
+    if any(count < 0 for _, count in deltas.values()):
+        conn.execute(text("DELETE FROM monthly_rollup WHERE tx_count <= 0"))
+
+    bump_data_version(conn, "monthly_rollup", accounts={key[0] for key in deltas})
+
+
+@timed()
+def refresh_monthly_rollup(conn):
+    # Bulk rebuild with one INSERT ... SELECT GROUP BY
+    conn.execute(text("DELETE FROM monthly_rollup"))
+    conn.execute(text(f"""
+        INSERT INTO monthly_rollup (account_id, month, type, category, amount, tx_count)
+        SELECT account_id, {_month_expr()}, type, COALESCE(category, ''), {amount_sql("SUM(amount)")},
+               COUNT(*)
+        FROM transactions
+        GROUP BY account_id, {_month_expr()}, type, COALESCE(category, '')
+    """))
+    bump_data_version(conn, "monthly_rollup", accounts=account_openings(conn))
+
+
+def rebuild_monthly_rollup():
+    with engine.begin() as conn:
+        refresh_monthly_rollup(conn)
 
 
 # ---------------- SETTINGS ----------------
-def get_setting(key):
+# The whole settings table is held in memory and reloaded only when the
+# "settings" data version moves, so hot reruns never query it.
+_settings_lock = threading.Lock()
+_settings_cache = {"version": None, "values": {}}
+
+
+def load_settings():
+    version = get_data_versions().get("settings", 0)
+
+    with _settings_lock:
+        if _settings_cache["version"] == version:
+            return dict(_settings_cache["values"])
+
     with engine.connect() as conn:
-        row = conn.execute(
-            text("SELECT value FROM settings WHERE key=:key"),
-            {"key": key}
-        ).fetchone()
+        rows = conn.execute(text("SELECT key, value FROM settings")).fetchall()
+
+    values = {row[0]: row[1] for row in rows}
+
+    with _settings_lock:
+        _settings_cache["version"] = version
+        _settings_cache["values"] = values
 
-    return row[0] if row else None
+    return dict(values)
+
+
+def get_setting(key):
+    return load_settings().get(key)
 
 
 def set_setting(key, value):
@@ -88,47 +536,246 @@ def set_setting(key, value):
             """),
             {"key": key, "value": str(value)}
         )
+        bump_data_version(conn, "settings")
+        new_version = conn.execute(
+            text("SELECT version FROM data_versions WHERE name='settings'")
+        ).fetchone()[0]
+
+    # write-through when the cache was current right before this write,
+    # otherwise let the next read reload everything
+    with _settings_lock:
+        if _settings_cache["version"] == int(new_version) - 1:
+            _settings_cache["values"][key] = str(value)
+            _settings_cache["version"] = int(new_version)
+        else:
+            _settings_cache["version"] = None
 
 
 # ---------------- NET WORTH TIMELINE ----------------
-@st.cache_data(ttl=20)
-def build_balance_timeline():
-    starting_balance = float(get_setting("starting_balance") or 0)
-    starting_date_str = get_setting("starting_date") or str(date.today())
+@versioned_cache("transactions@account_id", "balance@account_id", "settings")
+def build_balance_timeline(starting_balance=None, starting_date=None, account_id=None):
+    # One account's timeline, or every account's together. Values not
+    # passed in are read from the accounts and the settings table.
+    if starting_balance is None:
+        starting_balance = opening_balance(account_id)
+    if starting_date is None:
+        starting_date = get_setting("starting_date") or str(date.today())
+
+    df = load_transactions(account_id=account_id)
+
+    return compute_balance_timeline(df, starting_balance, starting_date)
+
+
+# ---------------- DAILY BALANCES ----------------
+# One series per account, from the starting date to the account's last
+# transaction. Writes refresh only the account they touch.
+@timed()
+def refresh_daily_balances(conn, from_date=None, account_id=None):
+    # Recompute daily_balances from from_date onwards (everything when None)
+    # for one account (every account when None). Runs on the caller's
+    # connection so it commits together with the write.
+    openings = account_openings(conn, account_id)
+    bump_data_version(conn, "daily_balances", accounts=openings)
+
+    starting_date = conn.execute(
+        text("SELECT value FROM settings WHERE key='starting_date'")
+    ).scalar()
+    start_date = pd.Timestamp(starting_date or str(date.today()))
+
+    for account, starting_balance in openings.items():
+        _refresh_account_daily_balances(conn, from_date, account, starting_balance, start_date)
+
+
+def _refresh_account_daily_balances(conn, from_date, account_id, starting_balance, start_date):
+    params = {"account_id": account_id}
+
+    last_row = None
+    if from_date is not None:
+        last_row = conn.execute(text(
+            "SELECT MAX(date) FROM daily_balances WHERE account_id = :account_id"
+        ), params).fetchone()[0]
+
+    if last_row is None:
+        from_ts = start_date
+    else:
+        # never leave a gap between the stored series and the recomputed part
+        from_ts = min(pd.Timestamp(from_date), pd.Timestamp(last_row) + pd.Timedelta(days=1))
+        from_ts = max(from_ts, start_date)
+
+    params["from_date"] = from_ts.strftime("%Y-%m-%d")
+
+    if from_ts == start_date:
+        conn.execute(text("DELETE FROM daily_balances WHERE account_id = :account_id"), params)
+        # transactions dated before the starting date open the series
+        signed = "SUM(CASE WHEN type = 'income' THEN amount WHEN type = 'expense' THEN -amount ELSE 0 END)"
+        opening = starting_balance + float(conn.execute(text(f"""
+            SELECT COALESCE({amount_sql(signed)}, 0)
+            FROM transactions
+            WHERE account_id = :account_id AND date < :from_date
+        """), params).scalar())
+    else:
+        conn.execute(text("""
+            DELETE FROM daily_balances
+            WHERE account_id = :account_id AND date >= :from_date
+        """), params)
+        row = conn.execute(text("""
+            SELECT closing_balance FROM daily_balances
+            WHERE account_id = :account_id AND date < :from_date
+            ORDER BY date DESC
+            LIMIT 1
+        """), params).fetchone()
+        opening = float(row[0]) if row else starting_balance
+
+    max_date = conn.execute(text(
+        "SELECT MAX(date) FROM transactions WHERE account_id = :account_id"
+    ), params).fetchone()[0]
+
+    if max_date is None:
+        return
+
+    end_date = max(pd.Timestamp(max_date), start_date)
+
+    if end_date < from_ts:
+        return
+
+    daily = pd.DataFrame(
+        conn.execute(text(f"""
+            SELECT date,
+                   {amount_sql("SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END)")} AS income,
+                   {amount_sql("SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END)")} AS expense
+            FROM transactions
+            WHERE account_id = :account_id AND date >= :from_date
+            GROUP BY date
+        """), params).fetchall(),
+        columns=["date", "income", "expense"]
+    )
+
+    all_days = pd.date_range(start=from_ts, end=end_date, freq="D")
+
+    if daily.empty:
+        daily = pd.DataFrame(0.0, index=all_days, columns=["income", "expense"])
+    else:
+        daily["date"] = pd.to_datetime(daily["date"])
+        daily = daily.set_index("date")[["income", "expense"]].astype(float)
+        daily = daily.reindex(all_days, fill_value=0.0)
+
+    daily["closing_balance"] = opening + (daily["income"] - daily["expense"]).cumsum()
+    daily["date"] = all_days.strftime("%Y-%m-%d")
+    daily["account_id"] = account_id
+
+    conn.execute(
+        text("""
+        INSERT INTO daily_balances (account_id, date, income, expense, closing_balance)
+        VALUES (:account_id, :date, :income, :expense, :closing_balance)
+        """),
+        daily.to_dict("records")
+    )
+
+
+def rebuild_daily_balances(account_id=None):
+    with engine.begin() as conn:
+        refresh_daily_balances(conn, account_id=account_id)
+
+
+def ensure_daily_balances():
+    # first run on an existing ledger: populate the table once
+    with engine.connect() as conn:
+        populated = conn.execute(text("SELECT 1 FROM daily_balances LIMIT 1")).fetchone()
+        has_transactions = conn.execute(text("SELECT 1 FROM transactions LIMIT 1")).fetchone()
+
+    if not populated and has_transactions:
+        rebuild_daily_balances()
+
+
+@versioned_cache("daily_balances@account_id")
+def load_balance_timeline(start=None, end=None, account_id=None):
+    # One account's closing balances, or with no account the consolidated
+    # net worth (see _consolidated_timeline)
+    if account_id is None:
+        return _consolidated_timeline(start, end)
+
+    ensure_daily_balances()
 
-    df = load_transactions()
+    query = "SELECT date, closing_balance AS balance FROM daily_balances"
+    params = {}
+    conditions = _account_filter(account_id, params) + _date_range_filter(start, end, params)
+
+    query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY date ASC"
+
+    with engine.connect() as conn:
+        df = pd.read_sql(text(query), conn, params=params)
+
+        if _needs_opening_row(df["date"].astype(str), start, end):
+            # the window starts after the account's last transaction: it
+            # opens with the balance carried over from before it
+            params = {}
+            conditions = _account_filter(account_id, params)
+            conditions.append("date < :start")
+            params["start"] = str(start)
+
+            previous = conn.execute(text(
+                "SELECT closing_balance FROM daily_balances WHERE " + " AND ".join(conditions)
+                + " ORDER BY date DESC LIMIT 1"
+            ), params).fetchone()
+
+            if previous is not None:
+                df = pd.concat([pd.DataFrame({"date": [str(start)], "balance": [previous[0]]}), df])
 
     if df.empty:
-        return pd.DataFrame(columns=["date", "balance"])
+        return empty_timeline()
+
+    df["date"] = pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d")
+    df["balance"] = df["balance"].astype(float)
+    return df.reset_index(drop=True)
+
+
+def _needs_opening_row(dates, start, end):
+    # True when the window [start, end) has no row on its first day
+    if start is None or (end is not None and str(start) >= str(end)):
+        return False
+    return dates.empty or str(dates.iloc[0])[:10] > str(start)
+
+
+def _consolidated_timeline(start, end):
+    # The sum of every account's full series, each loaded and cached under
+    # its own data version: after a write to one account only that account
+    # is read again, the rest is a merge in memory. Series end on their
+    # account's last transaction, so each is carried forward; accounts
+    # without transactions count with their opening balance.
+    accounts = load_accounts()
+
+    if len(accounts) == 1:
+        # nothing to merge: the account's own window
+        return load_balance_timeline(start, end, int(accounts["id"].iloc[0]))
 
-    df = df.copy()
-    df["date"] = pd.to_datetime(df["date"]).dt.date
-    df = df.sort_values("date")
+    series = {
+        int(account): load_balance_timeline(account_id=int(account)).set_index("date")["balance"]
+        for account in accounts["id"]
+    }
+    series = {account: values for account, values in series.items() if not values.empty}
 
-    start_date = pd.to_datetime(starting_date_str).date()
-    end_date = df["date"].max()
+    if not series:
+        return empty_timeline()
 
-    if end_date < start_date:
-        end_date = start_date
+    openings = dict(zip(accounts["id"].astype(int), accounts["opening_balance"]))
 
-    all_days = pd.date_range(start=start_date, end=end_date, freq="D").date
+    merged = pd.concat(series, axis=1).sort_index().ffill()
+    merged = merged.fillna({account: openings[account] for account in merged.columns})
 
-    balance = starting_balance
-    timeline = []
+    balance = merged.sum(axis=1) + sum(
+        opening for account, opening in openings.items() if account not in series
+    )
 
-    for day in all_days:
-        day_tx = df[df["date"] == day]
+    previous = balance[balance.index < str(start)] if start is not None else balance.iloc[:0]
 
-        if not day_tx.empty:
-            for _, row in day_tx.iterrows():
-                if row["type"] == "income":
-                    balance += float(row["amount"])
-                elif row["type"] == "expense":
-                    balance -= float(row["amount"])
+    if start is not None:
+        balance = balance[balance.index >= str(start)]
+    if end is not None:
+        balance = balance[balance.index < str(end)]
 
-        timeline.append({
-            "date": str(day),
-            "balance": balance
-        })
+    if _needs_opening_row(pd.Series(balance.index), start, end) and not previous.empty:
+        # carried over from before the window, as for a single account
+        balance = pd.concat([pd.Series([previous.iloc[-1]], index=[str(start)]), balance])
 
-    return pd.DataFrame(timeline)
\ No newline at end of file
+    return pd.DataFrame({"date": balance.index, "balance": balance.round(2).to_numpy()})
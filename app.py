@@ -1,30 +1,70 @@
 import os
 import streamlit as st
 import pandas as pd
-from datetime import date
-import plotly.express as px
-from sqlalchemy import text
+from datetime import date, timedelta
+from functools import partial
 from streamlit_cookies_manager import CookieManager
 
-from database import init_db, engine
+from database import init_db
+from cache import ANALYTICS_CACHE, use_cache
 from analytics import (
     load_transactions,
-    load_snapshots,
+    load_transactions_page,
+    load_categories,
     get_balance,
-    set_balance,
-    save_snapshot,
-    monthly_summary,
-    build_balance_timeline,
+    load_type_totals,
+    load_category_totals,
+    load_monthly_summary,
+    period_series,
+    load_balance_timeline,
+    load_accounts,
+    opening_balance,
+    rebuild_daily_balances,
     get_setting,
     set_setting
 )
+from ledger import (
+    add_transaction,
+    delete_transactions,
+    delete_matching,
+    override_balance,
+    create_account,
+    set_opening_balance
+)
+from locales import DEFAULT_LOCALE, LOCALE_NAMES, MONTH_NAMES, translate
+from profiling import PROFILE_LOG, PROFILE_PANEL, start_run, finish_run, set_info, span, profiled
 
 # ---------------- INIT DB ----------------
 init_db()
 
+# Loader results go to st.cache_data, shared by all sessions, unless
+# ANALYTICS_CACHE selects another backend (memory, disk, none)
+use_cache(ANALYTICS_CACHE or "streamlit")
+
 # ---------------- STREAMLIT CONFIG ----------------
 st.set_page_config(page_title="NetWorth Tracker", layout="wide")
 
+# ---------------- LOCALE ----------------
+# One app for every language: ?lang=es (or the sidebar) picks the catalog
+# for this session; all sessions share the process, pool and caches.
+if st.query_params.get("lang") in LOCALE_NAMES:
+    st.session_state.lang = st.query_params["lang"]
+
+if st.session_state.get("lang") not in LOCALE_NAMES:
+    st.session_state.lang = DEFAULT_LOCALE if DEFAULT_LOCALE in LOCALE_NAMES else "en"
+
+t = partial(translate, st.session_state.lang)
+month_names = MONTH_NAMES[st.session_state.lang]
+
+# ---------------- PROFILING ----------------
+# ?debug=1 (or PROFILE_PANEL=1) shows where this rerun spent its time in a
+# sidebar panel; PROFILE_LOG appends every profiled rerun to a JSONL file.
+show_debug_panel = PROFILE_PANEL or st.query_params.get("debug") == "1"
+profiling_on = show_debug_panel or bool(PROFILE_LOG)
+
+if profiling_on:
+    start_run("app")
+
 # ---------------- COOKIES (PERSISTENT LOGIN) ----------------
 cookies = CookieManager()
 
@@ -43,521 +83,694 @@ if cookies.get("auth") == "1":
 
 if APP_PASSWORD != "":
     if not st.session_state.authenticated:
-        st.title("🔒 Protected NetWorth Tracker")
+        st.title(t("login.title"))
 
-        password_input = st.text_input("Enter password", type="password")
+        password_input = st.text_input(t("login.password"), type="password")
 
-        if st.button("Login"):
+        if st.button(t("login.button")):
             if password_input == APP_PASSWORD:
                 st.session_state.authenticated = True
                 cookies["auth"] = "1"
                 cookies.save()
-                st.success("Welcome Sir 😈")
+                st.success(t("login.welcome"))
                 st.rerun()
             else:
-                st.error("Wrong password.")
+                st.error(t("login.wrong"))
 
         st.stop()
 
 # ---------------- TITLE ----------------
-st.title("💰 NetWorth Tracker (1 Capital Account)")
+st.title(t("app.title"))
 
 # ---------------- SIDEBAR MENU ----------------
-menu = st.sidebar.radio("📌 Menu", [
-    "Dashboard",
-    "Transactions",
-    "Timeline",
-    "Export",
-    "Settings"
-])
+# Labels go through t(): without a key, switching language would make
+# these new widgets and reset them to their defaults
+menu = st.sidebar.radio(
+    t("menu.label"),
+    ["dashboard", "transactions", "timeline", "export", "settings"],
+    format_func=lambda page: t(f"menu.{page}"),
+    key="page"
+)
+
+# Account: every page shows one account, or all of them consolidated
+accounts = load_accounts()
+account_names = dict(zip(accounts["id"].astype(int), accounts["name"]))
+
+account = st.sidebar.selectbox(
+    t("menu.account"),
+    [None] + list(account_names),
+    format_func=lambda account_id: t("accounts.all") if account_id is None else account_names[account_id],
+    key="account"
+)
+
+set_info(page=menu, account=account)
+
+# Language
+languages = list(LOCALE_NAMES)
+lang = st.sidebar.selectbox(
+    t("menu.language"),
+    languages,
+    index=languages.index(st.session_state.lang),
+    format_func=lambda code: LOCALE_NAMES[code]
+)
+
+if lang != st.session_state.lang:
+    st.session_state.lang = lang
+    st.query_params["lang"] = lang
+    st.rerun()
 
 # Logout
-if st.sidebar.button("🚪 Logout"):
+if st.sidebar.button(t("menu.logout")):
     st.session_state.authenticated = False
     cookies["auth"] = "0"
     cookies.save()
     st.rerun()
 
-# Month mapping
-month_names = {
-    1: "January", 2: "February", 3: "March", 4: "April",
-    5: "May", 6: "June", 7: "July", 8: "August",
-    9: "September", 10: "October", 11: "November", 12: "December"
-}
-
 # ---------------- DASHBOARD ----------------
-if menu == "Dashboard":
-    st.subheader("📊 Dashboard")
+# Page-specific modules (Plotly, importer, export, ...) are imported in
+# their page, so a cold start only pays for the page being shown.
+if menu == "dashboard":
+    import plotly.express as px
+    from charts import line_chart
+
+    st.subheader(t("dashboard.title"))
 
-    transactions_df = load_transactions()
-    starting_balance = float(get_setting("starting_balance") or 0)
+    starting_balance = opening_balance(account)
 
     # ---------------- NET WORTH LIVE ----------------
-    st.subheader("💎 Net Worth (Live)")
+    with span("dashboard.live"):
+        st.subheader(t("dashboard.live"))
 
-    if not transactions_df.empty:
-        total_income_all = transactions_df[transactions_df["type"] == "income"]["amount"].sum()
-        total_expense_all = transactions_df[transactions_df["type"] == "expense"]["amount"].sum()
-    else:
-        total_income_all = 0
-        total_expense_all = 0
+        totals_all = load_type_totals(account_id=account)
+        total_income_all = totals_all.get("income", 0.0)
+        total_expense_all = totals_all.get("expense", 0.0)
 
-    networth_today = starting_balance + total_income_all - total_expense_all
+        networth_today = starting_balance + total_income_all - total_expense_all
 
-    colA, colB, colC = st.columns(3)
-    colA.metric("💰 Net Worth Today", f"{networth_today:,.2f} €")
-    colB.metric("📈 Total Income (All Time)", f"{total_income_all:,.2f} €")
-    colC.metric("📉 Total Expenses (All Time)", f"{total_expense_all:,.2f} €")
+        colA, colB, colC = st.columns(3)
+        colA.metric(t("dashboard.networth_today"), f"{networth_today:,.2f} €")
+        colB.metric(t("dashboard.income_all"), f"{total_income_all:,.2f} €")
+        colC.metric(t("dashboard.expense_all"), f"{total_expense_all:,.2f} €")
 
     st.divider()
 
     # ---------------- NET WORTH CURVE ----------------
-    st.subheader("📉 Net Worth Curve (Daily)")
-
-    timeline_df = build_balance_timeline()
-
-    if not timeline_df.empty:
-        fig_nw = px.line(
-            timeline_df,
-            x="date",
-            y="balance",
-            markers=True,
-            title="Net Worth Evolution (Daily)"
-        )
+    with span("dashboard.curve"):
+        st.subheader(t("dashboard.curve"))
+
+        # all accounts: the per-account series, summed
+        timeline_df = load_balance_timeline(account_id=account)
+
+        if not timeline_df.empty:
+            fig_nw = line_chart(
+                timeline_df,
+                x="date",
+                y="balance",
+                title=t("dashboard.curve_title")
+            )
 
-        fig_nw.update_xaxes(type="category")
-        fig_nw.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Balance (€)"
-        )
+            fig_nw.update_layout(
+                xaxis_title=t("axis.date"),
+                yaxis_title=t("axis.balance")
+            )
 
-        st.plotly_chart(fig_nw, use_container_width=True)
-    else:
-        st.info("No timeline data available yet.")
+            st.plotly_chart(fig_nw, use_container_width=True)
+        else:
+            st.info(t("dashboard.no_timeline"))
 
     st.divider()
 
-    # ---------------- MONTH NAVIGATION ----------------
-    st.subheader("📅 Month Navigation")
-
-    today = date.today()
-
-    if "selected_year" not in st.session_state:
-        st.session_state.selected_year = today.year
-
-    if "selected_month" not in st.session_state:
-        st.session_state.selected_month = today.month
+    # ---------------- SELECTED PERIOD ----------------
+    # A fragment: month navigation, display mode and the balance checkbox
+    # rerun only this part, not the all-time sections around it.
+    @st.fragment
+    @profiled("dashboard.period", profiling_on)
+    def selected_period(has_transactions, account):
+        # ---------------- MONTH NAVIGATION ----------------
+        st.subheader(t("dashboard.navigation"))
+
+        today = date.today()
+
+        if "selected_year" not in st.session_state:
+            st.session_state.selected_year = today.year
+
+        if "selected_month" not in st.session_state:
+            st.session_state.selected_month = today.month
+
+        col_nav1, col_nav2, col_nav3 = st.columns([1, 2, 1])
+
+        with col_nav1:
+            if st.button(t("dashboard.previous_month")):
+                if st.session_state.selected_month == 1:
+                    st.session_state.selected_month = 12
+                    st.session_state.selected_year -= 1
+                else:
+                    st.session_state.selected_month -= 1
+
+        with col_nav3:
+            if st.button(t("dashboard.next_month")):
+                if st.session_state.selected_month == 12:
+                    st.session_state.selected_month = 1
+                    st.session_state.selected_year += 1
+                else:
+                    st.session_state.selected_month += 1
+
+        with col_nav2:
+            st.markdown(
+                f"<h3 style='text-align: center;'>📌 {month_names[st.session_state.selected_month]} {st.session_state.selected_year}</h3>",
+                unsafe_allow_html=True
+            )
 
-    col_nav1, col_nav2, col_nav3 = st.columns([1, 2, 1])
+        col_year, col_month = st.columns(2)
 
-    with col_nav1:
-        if st.button("⬅️ Previous Month"):
-            if st.session_state.selected_month == 1:
-                st.session_state.selected_month = 12
-                st.session_state.selected_year -= 1
-            else:
-                st.session_state.selected_month -= 1
+        with col_year:
+            year_list = list(range(2020, 2051))
+            st.session_state.selected_year = st.selectbox(
+                t("dashboard.select_year"),
+                year_list,
+                index=year_list.index(st.session_state.selected_year)
+            )
 
-    with col_nav3:
-        if st.button("Next Month ➡️"):
-            if st.session_state.selected_month == 12:
-                st.session_state.selected_month = 1
-                st.session_state.selected_year += 1
-            else:
-                st.session_state.selected_month += 1
+        with col_month:
+            st.session_state.selected_month = st.selectbox(
+                t("dashboard.select_month"),
+                list(range(1, 13)),
+                format_func=lambda m: month_names[m],
+                index=st.session_state.selected_month - 1
+            )
 
-    with col_nav2:
-        st.markdown(
-            f"<h3 style='text-align: center;'>📌 {month_names[st.session_state.selected_month]} {st.session_state.selected_year}</h3>",
-            unsafe_allow_html=True
-        )
+        selected_year = st.session_state.selected_year
+        selected_month = st.session_state.selected_month
 
-    col_year, col_month = st.columns(2)
+        st.divider()
 
-    with col_year:
-        year_list = list(range(2020, 2051))
-        st.session_state.selected_year = st.selectbox(
-            "Select Year",
-            year_list,
-            index=year_list.index(st.session_state.selected_year)
-        )
+        # ---------------- DISPLAY MODE ----------------
+        st.subheader(t("dashboard.display_mode"))
 
-    with col_month:
-        st.session_state.selected_month = st.selectbox(
-            "Select Month",
-            list(range(1, 13)),
-            format_func=lambda m: month_names[m],
-            index=st.session_state.selected_month - 1
+        display_mode = st.radio(
+            t("dashboard.choose_mode"),
+            ["daily", "cumulative_month", "cumulative_year"],
+            format_func=lambda mode: t(f"mode.{mode}"),
+            index=1,
+            horizontal=True,
+            key="display_mode"
         )
 
-    selected_year = st.session_state.selected_year
-    selected_month = st.session_state.selected_month
-
-    st.divider()
-
-    # ---------------- DISPLAY MODE ----------------
-    st.subheader("📌 Display Mode")
+        show_balance = st.checkbox(t("dashboard.show_balance"), value=False, key="show_balance")
 
-    display_mode = st.radio(
-        "Choose display mode:",
-        ["Daily (Normal)", "Cumulative (Month)", "Cumulative (Year)"],
-        index=1,
-        horizontal=True
-    )
-
-    show_balance = st.checkbox("Show balance curve (Net Worth)", value=False)
-
-    st.divider()
-
-    if not transactions_df.empty:
-        df_all = transactions_df.copy()
-        df_all["date"] = pd.to_datetime(df_all["date"]).dt.date
-    else:
-        df_all = pd.DataFrame()
+        st.divider()
 
-    if display_mode == "Cumulative (Year)":
-        start_date = date(selected_year, 1, 1)
-        end_date = date(selected_year + 1, 1, 1)
-    else:
-        start_date = date(selected_year, selected_month, 1)
-        if selected_month == 12:
+        if display_mode == "cumulative_year":
+            start_date = date(selected_year, 1, 1)
             end_date = date(selected_year + 1, 1, 1)
         else:
-            end_date = date(selected_year, selected_month + 1, 1)
-
-    if not df_all.empty:
-        df_period = df_all[(df_all["date"] >= start_date) & (df_all["date"] < end_date)].copy()
-    else:
-        df_period = pd.DataFrame()
-
-    st.subheader("📈 Income / Expenses")
-
-    if not df_all.empty:
-        daily_summary = df_period.groupby(["date", "type"])["amount"].sum().reset_index()
-        pivot = daily_summary.pivot(index="date", columns="type", values="amount").fillna(0)
+            start_date = date(selected_year, selected_month, 1)
+            if selected_month == 12:
+                end_date = date(selected_year + 1, 1, 1)
+            else:
+                end_date = date(selected_year, selected_month + 1, 1)
 
-        if "income" not in pivot.columns:
-            pivot["income"] = 0
-        if "expense" not in pivot.columns:
-            pivot["expense"] = 0
+        with span("dashboard.period.chart"):
+            # only the selected window, and only the columns the chart needs
+            df_period = load_transactions(start_date, end_date, ("type", "amount_cents"), account)
 
-        pivot = pivot.sort_index()
-        merged = pivot.reset_index()[["date", "income", "expense"]]
+            st.subheader(t("dashboard.income_expenses"))
 
-        all_days = pd.date_range(start=start_date, end=end_date - pd.Timedelta(days=1), freq="D").date
-        merged["date"] = pd.to_datetime(merged["date"]).dt.date
-        merged = merged.set_index("date").reindex(all_days, fill_value=0).reset_index()
-        merged = merged.rename(columns={"index": "date"})
+            if has_transactions:
+                merged = period_series(
+                    df_period,
+                    start_date,
+                    end_date,
+                    cumulative=display_mode in ["cumulative_month", "cumulative_year"]
+                )
 
-        if display_mode in ["Cumulative (Month)", "Cumulative (Year)"]:
-            merged["income"] = merged["income"].cumsum()
-            merged["expense"] = merged["expense"].cumsum()
+                if show_balance:
+                    # the window's days only, not the whole history
+                    timeline_df2 = load_balance_timeline(start_date, end_date, account)
+                    timeline_df2["date"] = pd.to_datetime(timeline_df2["date"]).dt.date
+                    merged = pd.merge(merged, timeline_df2, on="date", how="left")
+                    merged["balance"] = merged["balance"].ffill().fillna(0)
 
-        if show_balance:
-            timeline_df2 = build_balance_timeline()
-            timeline_df2["date"] = pd.to_datetime(timeline_df2["date"]).dt.date
-            merged = pd.merge(merged, timeline_df2, on="date", how="left")
-            merged["balance"] = merged["balance"].ffill().fillna(0)
+                if display_mode == "cumulative_year":
+                    title = f"{t('mode.' + display_mode)} - {selected_year}"
+                else:
+                    title = f"{t('mode.' + display_mode)} - {month_names[selected_month]} {selected_year}"
 
-        if display_mode == "Cumulative (Year)":
-            title = f"{display_mode} - {selected_year}"
-        else:
-            title = f"{display_mode} - {month_names[selected_month]} {selected_year}"
+                y_cols = ["income", "expense"]
+                if show_balance:
+                    y_cols.append("balance")
 
-        y_cols = ["income", "expense"]
-        if show_balance:
-            y_cols.append("balance")
+                fig = line_chart(merged, x="date", y=y_cols, title=title)
 
-        fig = px.line(merged, x="date", y=y_cols, markers=True, title=title)
+                fig.update_layout(
+                    xaxis_title=t("axis.date"),
+                    yaxis_title=t("axis.amount"),
+                    legend_title=t("dashboard.metrics")
+                )
 
-        fig.update_xaxes(type="category")
-        fig.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Amount (€)",
-            legend_title="Metrics"
-        )
+                for trace in fig.data:
+                    if trace.name == "income":
+                        trace.line.color = "#7CFC00"
+                    elif trace.name == "expense":
+                        trace.line.color = "red"
+                    elif trace.name == "balance":
+                        trace.line.color = "gray"
 
-        for trace in fig.data:
-            if trace.name == "income":
-                trace.line.color = "#7CFC00"
-            elif trace.name == "expense":
-                trace.line.color = "red"
-            elif trace.name == "balance":
-                trace.line.color = "gray"
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info(t("no_transactions"))
 
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("No transactions yet.")
+        st.divider()
 
-    st.divider()
+        st.subheader(t("dashboard.period_totals"))
 
-    st.subheader("📌 Totals (Selected Period)")
+        with span("dashboard.period.totals"):
+            totals_period = load_type_totals(start_date, end_date, account)
 
-    if not df_period.empty:
-        total_income_period = df_period[df_period["type"] == "income"]["amount"].sum()
-        total_expense_period = df_period[df_period["type"] == "expense"]["amount"].sum()
+            if totals_period:
+                total_income_period = totals_period.get("income", 0.0)
+                total_expense_period = totals_period.get("expense", 0.0)
 
-        colx, coly = st.columns(2)
-        colx.metric("📈 Total Income", f"{total_income_period:,.2f} €")
-        coly.metric("📉 Total Expenses", f"{total_expense_period:,.2f} €")
-    else:
-        st.info("No transactions in this selected period.")
+                colx, coly = st.columns(2)
+                colx.metric(t("dashboard.income"), f"{total_income_period:,.2f} €")
+                coly.metric(t("dashboard.expense"), f"{total_expense_period:,.2f} €")
+            else:
+                st.info(t("dashboard.no_period_transactions"))
 
-    st.divider()
+        st.divider()
 
-    st.subheader("🍕 Expenses by Category (Selected Month)")
+        st.subheader(t("dashboard.by_category"))
 
-    if display_mode != "Cumulative (Year)" and not df_period.empty:
-        expenses_df = df_period[df_period["type"] == "expense"]
+        with span("dashboard.period.categories"):
+            if display_mode != "cumulative_year":
+                cat = load_category_totals(start_date, end_date, "expense", account)
 
-        if not expenses_df.empty:
-            cat = expenses_df.groupby("category")["amount"].sum().reset_index()
+                if not cat.empty:
+                    fig_pie = px.pie(
+                        cat,
+                        names="category",
+                        values="amount",
+                        title=t("dashboard.pie_title", month=month_names[selected_month], year=selected_year)
+                    )
+                    st.plotly_chart(fig_pie, use_container_width=True)
+                else:
+                    st.info(t("dashboard.no_month_expenses"))
+            else:
+                st.info(t("dashboard.pie_month_only"))
 
-            fig_pie = px.pie(
-                cat,
-                names="category",
-                values="amount",
-                title=f"Expenses ({month_names[selected_month]} {selected_year})"
-            )
-            st.plotly_chart(fig_pie, use_container_width=True)
-        else:
-            st.info("No expenses for this month.")
-    else:
-        st.info("Pie chart available only for Month view.")
+    selected_period(bool(totals_all), account)
 
     st.divider()
 
-    st.subheader("📅 Monthly Income vs Expenses (All Time)")
+    st.subheader(t("dashboard.monthly"))
+
+    with span("dashboard.monthly"):
+        monthly = load_monthly_summary(account)
 
-    if not transactions_df.empty:
-        monthly = monthly_summary(transactions_df)
         if not monthly.empty:
             fig_monthly = px.bar(
                 monthly,
                 x="month",
                 y="amount",
                 color="type",
-                title="Monthly Income vs Expenses"
+                title=t("dashboard.monthly_title")
             )
             st.plotly_chart(fig_monthly, use_container_width=True)
 
 
 # ---------------- TRANSACTIONS ----------------
-elif menu == "Transactions":
-    st.subheader("🧾 Transactions")
+elif menu == "transactions":
+    from importer import import_csv
 
-    balance = get_balance()
+    st.subheader(t("transactions.title"))
+
+    # new rows go to the account picked in the sidebar, or the first one
+    account_ids = list(account_names)
+    default_account = account_ids.index(account) if account in account_ids else 0
 
     with st.form("add_transaction"):
-        t_date = st.date_input("Date", value=date.today())
-        t_type = st.selectbox("Type", ["expense", "income"])
+        t_account = st.selectbox(
+            t("transactions.account"),
+            account_ids,
+            index=default_account,
+            format_func=account_names.get
+        )
+        t_date = st.date_input(t("transactions.date"), value=date.today())
+        t_type = st.selectbox(
+            t("transactions.type"),
+            ["expense", "income"],
+            format_func=lambda x: t(f"type.{x}")
+        )
 
         category_list = ["rent", "elec", "agua", "wifi", "food", "gas", "outfit", "other"]
-        t_category = st.selectbox("Category", category_list)
+        t_category = st.selectbox(t("transactions.category"), category_list)
 
         if t_category == "other":
-            custom_category = st.text_input("Custom category")
+            custom_category = st.text_input(t("transactions.custom_category"))
             if custom_category.strip() != "":
                 t_category = custom_category.strip().lower()
 
-        t_amount = st.number_input("Amount (€)", min_value=0.0, step=1.0)
-        t_note = st.text_input("Note (optional)")
+        t_amount = st.number_input(t("transactions.amount"), min_value=0.0, step=1.0)
+        t_note = st.text_input(t("transactions.note"))
 
-        submitted = st.form_submit_button("➕ Add Transaction")
+        submitted = st.form_submit_button(t("transactions.add"))
 
         if submitted:
-            with engine.begin() as conn:
-                conn.execute(
-                    text("""
-                    INSERT INTO transactions (date, type, category, amount, note)
-                    VALUES (:date, :type, :category, :amount, :note)
-                    """),
-                    {
-                        "date": str(t_date),
-                        "type": t_type,
-                        "category": t_category,
-                        "amount": float(t_amount),
-                        "note": t_note
-                    }
-                )
-
-            if t_type == "expense":
-                balance -= float(t_amount)
-            else:
-                balance += float(t_amount)
+            _, balance = add_transaction(t_date, t_type, t_category, t_amount, t_note, t_account)
 
-            set_balance(balance)
-            save_snapshot()
-
-            st.cache_data.clear()
-            st.success(f"Transaction added! New balance: {balance:,.2f} €")
+            st.success(t("transactions.added", balance=balance))
             st.rerun()
 
     st.divider()
 
-    df = load_transactions()
+    st.subheader(t("transactions.import"))
 
-    if df.empty:
-        st.info("No transactions yet.")
-    else:
-        st.dataframe(df, use_container_width=True)
+    import_account = st.selectbox(
+        t("transactions.account"),
+        account_ids,
+        index=default_account,
+        format_func=account_names.get,
+        key="import_account"
+    )
+    uploaded_csv = st.file_uploader(t("transactions.import_file"), type="csv")
 
-        st.divider()
+    if uploaded_csv is not None and st.button(t("transactions.import_button")):
+        try:
+            result = import_csv(uploaded_csv, account_id=import_account)
+        except ValueError as exc:
+            st.error(t("transactions.import_failed", error=exc))
+        else:
+            st.success(
+                t("transactions.imported", inserted=result["inserted"], skipped=result["skipped"])
+            )
 
-        st.subheader("🗑️ Delete Transaction (Auto reverse impact)")
+    st.divider()
 
-        selected_id = st.selectbox("Select Transaction ID", df["id"].tolist())
+    # ---------------- TRANSACTIONS GRID ----------------
+    # Filters run in SQL and pages are keyset-paginated on (date, id), so a
+    # page costs the same at the start and at the end of a long ledger.
+    # A fragment: filtering and paging rerun only the grid.
+    def set_transactions_page(cursor, backward):
+        st.session_state.tx_page = {"cursor": cursor, "backward": backward}
+
+    @st.fragment
+    @profiled("transactions.grid", profiling_on)
+    def transactions_grid():
+        st.subheader(t("transactions.browse"))
+
+        col_from, col_to, col_type, col_category = st.columns(4)
+
+        date_from = col_from.date_input(t("filter.from"), value=None)
+        date_to = col_to.date_input(t("filter.to"), value=None)
+        filter_type = col_type.selectbox(
+            t("filter.type"),
+            [None, "expense", "income"],
+            format_func=lambda x: t("filter.all") if x is None else t(f"type.{x}")
+        )
+        filter_category = col_category.selectbox(
+            t("filter.category"),
+            [None] + load_categories(),
+            format_func=lambda x: t("filter.all") if x is None else x
+        )
 
-        if st.button("Delete selected transaction"):
-            with engine.begin() as conn:
-                row = conn.execute(
-                    text("SELECT type, amount FROM transactions WHERE id=:id"),
-                    {"id": int(selected_id)}
-                ).fetchone()
+        col_min, col_max = st.columns(2)
+
+        min_amount = col_min.number_input(t("filter.min_amount"), min_value=0.0, value=None, step=1.0)
+        max_amount = col_max.number_input(t("filter.max_amount"), min_value=0.0, value=None, step=1.0)
+
+        filters = {
+            "start": date_from,
+            # the "To" day is included
+            "end": date_to + timedelta(days=1) if date_to else None,
+            "t_type": filter_type,
+            "category": filter_category,
+            "min_amount": min_amount,
+            "max_amount": max_amount,
+            "account_id": account
+        }
+
+        # new filters start again from the first page
+        if st.session_state.get("tx_filters") != filters:
+            st.session_state.tx_filters = filters
+            set_transactions_page(None, False)
+
+        page = st.session_state.tx_page
+        df, has_more = load_transactions_page(page["cursor"], page["backward"], **filters)
+
+        if df.empty and page["cursor"] is not None:
+            # the rows around the cursor are gone (e.g. deleted)
+            set_transactions_page(None, False)
+            page = st.session_state.tx_page
+            df, has_more = load_transactions_page(None, False, **filters)
+
+        if df.empty:
+            no_filters = all(value is None for value in filters.values())
+            st.info(t("no_transactions") if no_filters else t("transactions.no_match"))
+            return
+
+        if page["backward"]:
+            has_previous, has_next = has_more, page["cursor"] is not None
+        else:
+            has_previous, has_next = page["cursor"] is not None, has_more
+
+        # account names instead of ids
+        shown = df.assign(account_id=df["account_id"].map(account_names))
+        st.dataframe(
+            shown.rename(columns={"account_id": "account"}),
+            use_container_width=True,
+            hide_index=True
+        )
 
-                if row:
-                    t_type = row[0]
-                    t_amount = float(row[1])
+        first = (df["date"].iloc[0], int(df["id"].iloc[0]))
+        last = (df["date"].iloc[-1], int(df["id"].iloc[-1]))
 
-                    current_balance = get_balance()
+        col_first, col_previous, col_next, col_last = st.columns(4)
 
-                    if t_type == "expense":
-                        current_balance += t_amount
-                    else:
-                        current_balance -= t_amount
+        col_first.button(t("page.first"), disabled=not has_previous,
+                         on_click=set_transactions_page, args=(None, False))
+        col_previous.button(t("page.previous"), disabled=not has_previous,
+                            on_click=set_transactions_page, args=(first, True))
+        col_next.button(t("page.next"), disabled=not has_next,
+                        on_click=set_transactions_page, args=(last, False))
+        col_last.button(t("page.last"), disabled=not has_next,
+                        on_click=set_transactions_page, args=(None, True))
 
-                    set_balance(current_balance)
+        st.divider()
 
-                    conn.execute(
-                        text("DELETE FROM transactions WHERE id=:id"),
-                        {"id": int(selected_id)}
-                    )
+        st.subheader(t("transactions.delete"))
+
+        # one DELETE ... RETURNING and one balance adjustment per click
+        selected_ids = st.multiselect(t("transactions.select_id"), df["id"].tolist())
 
-            save_snapshot()
-            st.cache_data.clear()
-            st.success("Transaction deleted and balance corrected.")
+        if st.button(t("transactions.delete_button"), disabled=not selected_ids):
+            deleted, _ = delete_transactions(selected_ids)
+            st.success(t("transactions.deleted", count=deleted))
             st.rerun()
 
+        if any(value is not None for value in filters.values()):
+            confirm = st.checkbox(t("transactions.delete_matching_confirm"))
+
+            if st.button(t("transactions.delete_matching"), disabled=not confirm):
+                deleted, _ = delete_matching(**filters)
+                st.success(t("transactions.deleted", count=deleted))
+                st.rerun()
+
+    transactions_grid()
+
 
 # ---------------- TIMELINE ----------------
-elif menu == "Timeline":
-    st.subheader("📈 Net Worth Evolution (Transaction-Based)")
+elif menu == "timeline":
+    from charts import line_chart
+    from snapshots import rebuild_snapshots
 
-    starting_balance = float(get_setting("starting_balance") or 0)
+    st.subheader(t("timeline.title"))
+
+    starting_balance = opening_balance(account)
     starting_date_str = get_setting("starting_date") or str(date.today())
 
     colA, colB = st.columns(2)
-    colA.metric("📌 Current Starting Balance", f"{starting_balance:,.2f} €")
-    colB.metric("📅 Current Starting Date", starting_date_str)
+    colA.metric(t("timeline.starting_balance"), f"{starting_balance:,.2f} €")
+    colB.metric(t("timeline.starting_date"), starting_date_str)
 
     st.divider()
 
-    st.subheader("⚙️ Edit Timeline Starting Point")
+    st.subheader(t("timeline.edit"))
 
     with st.form("update_timeline_settings"):
+        # the date is shared by all accounts, the balance is per account
         new_starting_balance = st.number_input(
-            "Starting Balance (€)",
+            t("timeline.balance_input"),
             value=float(starting_balance),
-            step=100.0
+            step=100.0,
+            disabled=account is None,
+            help=t("timeline.balance_per_account") if account is None else None
         )
 
         new_starting_date = st.date_input(
-            "Starting Date",
+            t("timeline.date_input"),
             value=pd.to_datetime(starting_date_str)
         )
 
-        submitted = st.form_submit_button("💾 Save Starting Point")
+        submitted = st.form_submit_button(t("timeline.save"))
 
         if submitted:
-            set_setting("starting_balance", str(new_starting_balance))
-            set_setting("starting_date", str(new_starting_date))
+            if str(new_starting_date) != starting_date_str:
+                set_setting("starting_date", str(new_starting_date))
+                rebuild_daily_balances()
+                rebuild_snapshots()
 
-            st.cache_data.clear()
-            st.success("Starting point updated successfully!")
+            if account is not None and new_starting_balance != starting_balance:
+                set_opening_balance(account, new_starting_balance)
+
+            st.success(t("timeline.saved"))
             st.rerun()
 
     st.divider()
 
-    timeline_df = build_balance_timeline()
+    timeline_df = load_balance_timeline(account_id=account)
 
     if timeline_df.empty:
-        st.info("No timeline data available yet.")
+        st.info(t("timeline.no_data"))
     else:
-        fig = px.line(
+        fig = line_chart(
             timeline_df,
             x="date",
             y="balance",
-            markers=True,
-            title="📈 Net Worth Curve (Daily)"
+            title=t("timeline.curve_title")
         )
 
-        fig.update_xaxes(type="category")
         fig.update_layout(
-            xaxis_title="Date",
-            yaxis_title="Balance (€)"
+            xaxis_title=t("axis.date"),
+            yaxis_title=t("axis.balance")
         )
 
         st.plotly_chart(fig, use_container_width=True)
 
         st.divider()
 
-        st.subheader("📋 Timeline Data")
+        st.subheader(t("timeline.data"))
         st.dataframe(timeline_df, use_container_width=True)
 
 
 # ---------------- EXPORT ----------------
-elif menu == "Export":
-    st.subheader("📤 Export Data")
+elif menu == "export":
+    from export import export_file
 
-    transactions_df = load_transactions()
-    snapshots_df = load_snapshots()
-    timeline_df = build_balance_timeline()
+    st.subheader(t("export.title"))
 
+    # each file is built only when its button is clicked, streamed from the DB
     st.download_button(
-        "⬇️ Download Transactions CSV",
-        transactions_df.to_csv(index=False).encode("utf-8"),
+        t("export.transactions"),
+        partial(export_file, "transactions"),
         "transactions.csv",
         "text/csv"
     )
 
     st.download_button(
-        "⬇️ Download Snapshots CSV",
-        snapshots_df.to_csv(index=False).encode("utf-8"),
+        t("export.snapshots"),
+        partial(export_file, "snapshots"),
         "snapshots.csv",
         "text/csv"
     )
 
     st.download_button(
-        "⬇️ Download Timeline CSV",
-        timeline_df.to_csv(index=False).encode("utf-8"),
+        t("export.timeline"),
+        partial(export_file, "timeline"),
         "timeline.csv",
         "text/csv"
     )
 
-    st.success("Export ready.")
+    st.success(t("export.ready"))
 
 
 # ---------------- SETTINGS ----------------
-elif menu == "Settings":
-    st.subheader("⚙️ Settings")
+elif menu == "settings":
+    from reconcile import reconcile
+
+    st.subheader(t("settings.title"))
 
-    balance = get_balance()
-    st.metric("Main Balance (DB)", f"{balance:,.2f} €")
+    balance = get_balance(account)
+    st.metric(t("settings.balance"), f"{balance:,.2f} €")
 
     st.divider()
 
-    st.subheader("⚠️ Manual Balance Override")
+    st.subheader(t("settings.override"))
 
-    new_balance = st.number_input(
-        "Set Main Balance (€)",
-        value=float(balance),
-        step=100.0
-    )
+    if account is None:
+        st.info(t("settings.select_account"))
+    else:
+        new_balance = st.number_input(
+            t("settings.balance_input"),
+            value=float(balance),
+            step=100.0
+        )
 
-    if st.button("💾 Update Main Balance"):
-        set_balance(new_balance)
-        save_snapshot()
+        if st.button(t("settings.update")):
+            override_balance(new_balance, account)
+
+            st.success(t("settings.updated"))
+            st.rerun()
 
-        st.cache_data.clear()
-        st.success("Balance updated!")
-        st.rerun()
\ No newline at end of file
+    st.divider()
+
+    # ---------------- ACCOUNTS ----------------
+    st.subheader(t("settings.accounts"))
+
+    st.dataframe(accounts, use_container_width=True, hide_index=True)
+
+    with st.form("add_account", clear_on_submit=True):
+        account_name = st.text_input(t("settings.account_name"))
+        account_opening = st.number_input(t("settings.account_opening"), value=0.0, step=100.0)
+
+        if st.form_submit_button(t("settings.add_account")):
+            if account_name.strip() == "":
+                st.error(t("settings.account_name_required"))
+            else:
+                create_account(account_name, account_opening)
+
+                st.success(t("settings.account_added", name=account_name.strip()))
+                st.rerun()
+
+    st.divider()
+
+    st.subheader(t("settings.reconcile"))
+
+    col_check, col_repair = st.columns(2)
+
+    if col_check.button(t("settings.check")):
+        drift = reconcile()
+
+        if drift.empty:
+            st.success(t("settings.consistent"))
+        else:
+            st.dataframe(drift, use_container_width=True)
+
+    if col_repair.button(t("settings.repair")):
+        drift = reconcile(repair=True)
+        st.success(t("settings.repaired", count=len(drift)))
+
+# ---------------- DEBUG PANEL ----------------
+# Covers full reruns only: a fragment rerun cannot draw in the sidebar, so
+# those are recorded to PROFILE_LOG alone.
+if profiling_on:
+    report = finish_run()
+
+    if show_debug_panel and report:
+        with st.sidebar.expander(t("debug.title")):
+            st.caption(t(
+                "debug.summary",
+                total=report["total_ms"],
+                queries=report["query_count"],
+                query_ms=report["query_ms"]
+            ))
+
+            spans = pd.DataFrame(report["spans"])
+            if not spans.empty:
+                spans["name"] = spans["depth"].map(lambda depth: "· " * depth) + spans["name"]
+                st.caption(t("debug.spans"))
+                st.dataframe(spans.drop(columns="depth"), hide_index=True)
+
+            queries = pd.DataFrame(report["queries"])
+            if not queries.empty:
+                st.caption(t("debug.queries"))
+                st.dataframe(queries.sort_values("ms", ascending=False), hide_index=True)
@@ -0,0 +1,318 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, ROOT)
+
+
+# Ledger sizes as rows:years pairs; add 1000000:20 for the full-scale run
+BENCH_SIZES = os.getenv("BENCH_SIZES", "1000:1,100000:10")
+
+BENCH_SEED = int(os.getenv("BENCH_SEED", "0"))
+
+# A throwaway Postgres database: its public schema is dropped on every run
+BENCH_POSTGRES_URL = os.getenv("BENCH_POSTGRES_URL")
+
+# Timed rounds per metric; the median is reported
+BENCH_ROUNDS = int(os.getenv("BENCH_ROUNDS", "5"))
+
+# A metric regresses when it is this much slower than the baseline, and by
+# more than BENCH_MIN_DELTA_MS so timer noise on tiny metrics is ignored
+BENCH_TOLERANCE = float(os.getenv("BENCH_TOLERANCE", "0.3"))
+BENCH_MIN_DELTA_MS = float(os.getenv("BENCH_MIN_DELTA_MS", "5"))
+
+# The committed baseline.json holds timings from one reference machine
+# (default BENCH_SIZES, with BENCH_POSTGRES_URL set). Timings are machine
+# specific: on another machine re-save it with --save-baseline first.
+BENCH_BASELINE = os.getenv("BENCH_BASELINE", os.path.join(HERE, "baseline.json"))
+
+# Money sums are compared to the cent, with room for float summation error
+MONEY_TOLERANCE = 0.01
+
+
+# ---------------- REFERENCE ----------------
+# Expected results computed straight from the generated frame, independent
+# of the SQL, the derived tables and the caches under test.
+def signed(df):
+    return df["amount"].where(df["type"] == "income", -df["amount"])
+
+
+def reference_monthly(df):
+    months = df["date"].str[:7].rename("month")
+    return df.groupby([months, "type"])["amount"].sum()
+
+
+def reference_window(df, start, end):
+    return df[(df["date"] >= str(start)) & (df["date"] < str(end))]
+
+
+def last_month(df):
+    last = pd.Timestamp(df["date"].max())
+    start = date(last.year, last.month, 1)
+    end = (pd.Timestamp(start) + pd.DateOffset(months=1)).date()
+    return start, end
+
+
+def last_year(df):
+    last = pd.Timestamp(df["date"].max())
+    return date(last.year, 1, 1), date(last.year + 1, 1, 1)
+
+
+# ---------------- CHECKS ----------------
+def check_money(failures, name, actual, expected):
+    if abs(float(actual) - float(expected)) > MONEY_TOLERANCE:
+        failures.append(f"{name}: got {float(actual):.2f}, expected {float(expected):.2f}")
+
+
+def check_monthly(failures, name, actual, expected):
+    actual = actual.set_index(["month", "type"])["amount"]
+
+    if set(actual.index) != set(expected.index):
+        failures.append(f"{name}: months/types differ from the reference")
+        return
+
+    diff = (actual.reindex(expected.index) - expected).abs().max()
+    if diff > MONEY_TOLERANCE:
+        failures.append(f"{name}: off by up to {diff:.2f}")
+
+
+def check_results(df, starting_balance):
+    from analytics import (
+        load_transactions,
+        build_balance_timeline,
+        load_balance_timeline,
+        monthly_summary,
+        load_monthly_summary,
+        load_type_totals,
+        load_category_totals,
+        period_series,
+    )
+
+    failures = []
+
+    loaded = load_transactions()
+    if len(loaded) != len(df):
+        failures.append(f"load_transactions: {len(loaded)} rows, expected {len(df)}")
+    if not loaded.index.is_monotonic_increasing:
+        failures.append("load_transactions: not ordered by date")
+    check_money(failures, "load_transactions amount", loaded["amount_cents"].sum() / 100, df["amount"].sum())
+
+    final_balance = starting_balance + signed(df).sum()
+    days = (pd.Timestamp(df["date"].max()) - pd.Timestamp(df["date"].min())).days + 1
+
+    timeline = build_balance_timeline()
+    if len(timeline) != days:
+        failures.append(f"build_balance_timeline: {len(timeline)} days, expected {days}")
+    check_money(failures, "build_balance_timeline final", timeline["balance"].iloc[-1], final_balance)
+
+    # daily_balances also stops at the last transaction day; it must
+    # agree with the in-memory timeline on every day
+    stored = load_balance_timeline().set_index("date")["balance"]
+    common = timeline.set_index("date")["balance"]
+    if not common.index.isin(stored.index).all():
+        failures.append("load_balance_timeline: days missing from daily_balances")
+    else:
+        diff = (stored.reindex(common.index) - common).abs().max()
+        if diff > MONEY_TOLERANCE:
+            failures.append(f"load_balance_timeline: off by up to {diff:.2f}")
+        check_money(failures, "load_balance_timeline final", stored.iloc[-1], final_balance)
+
+    expected_monthly = reference_monthly(df)
+    check_monthly(failures, "monthly_summary", monthly_summary(loaded), expected_monthly)
+    check_monthly(failures, "load_monthly_summary", load_monthly_summary(), expected_monthly)
+
+    for label, (start, end) in (("month", last_month(df)), ("year", last_year(df))):
+        window = reference_window(df, start, end)
+        expected = window.groupby("type")["amount"].sum()
+
+        series = period_series(load_transactions(start, end, ("type", "amount_cents")), start, end, True)
+        totals = load_type_totals(start, end)
+
+        for t_type in ("income", "expense"):
+            check_money(failures, f"period_series {label} {t_type}", series[t_type].iloc[-1], expected.get(t_type, 0))
+            check_money(failures, f"load_type_totals {label} {t_type}", totals.get(t_type, 0), expected.get(t_type, 0))
+
+        categories = load_category_totals(start, end, "expense").set_index("category")["amount"]
+        expected_categories = window[window["type"] == "expense"].groupby("category")["amount"].sum()
+        if set(categories.index) != set(expected_categories.index):
+            failures.append(f"load_category_totals {label}: categories differ from the reference")
+        elif (categories - expected_categories).abs().max() > MONEY_TOLERANCE:
+            failures.append(f"load_category_totals {label}: totals differ from the reference")
+
+    return failures
+
+
+# ---------------- MEASURE ----------------
+def dashboard_period(start, end, cumulative):
+    # What the Dashboard period fragment loads and computes for one window,
+    # balance line included
+    from analytics import (
+        load_transactions,
+        load_type_totals,
+        load_category_totals,
+        load_balance_timeline,
+        period_series,
+    )
+
+    merged = period_series(load_transactions(start, end, ("type", "amount_cents")), start, end, cumulative)
+    load_balance_timeline(start, end)
+    load_type_totals(start, end)
+    load_category_totals(start, end, "expense")
+    return merged
+
+
+def timed(func, cold=True, rounds=BENCH_ROUNDS):
+    # Median milliseconds; cold rounds clear the result caches first so
+    # they measure the queries and pandas work, not a cache hit
+    from cache import clear_cache
+
+    func()
+    samples = []
+    for _ in range(rounds):
+        if cold:
+            clear_cache()
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return float(np.median(samples))
+
+
+def measure(df):
+    from analytics import (
+        load_transactions,
+        build_balance_timeline,
+        load_balance_timeline,
+        monthly_summary,
+        load_monthly_summary,
+    )
+
+    month = last_month(df)
+    year = last_year(df)
+    loaded = load_transactions()
+
+    return {
+        "load_transactions": timed(load_transactions),
+        "build_balance_timeline": timed(build_balance_timeline),
+        "load_balance_timeline": timed(load_balance_timeline),
+        "monthly_summary": timed(lambda: monthly_summary(loaded)),
+        "load_monthly_summary": timed(load_monthly_summary),
+        "dashboard_month": timed(lambda: dashboard_period(*month, True)),
+        "dashboard_year": timed(lambda: dashboard_period(*year, True)),
+        "dashboard_month_cached": timed(lambda: dashboard_period(*month, True), cold=False),
+    }
+
+
+def reset_postgres(url):
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+    engine.dispose()
+
+
+def run_one(backend, rows, years):
+    # In a child process: DATABASE_URL is fixed once database.py is imported
+    from synthetic import generate_ledger, load_ledger
+
+    if backend == "postgres":
+        reset_postgres(os.environ["DATABASE_URL"])
+
+    df = generate_ledger(rows, years, BENCH_SEED)
+
+    started = time.perf_counter()
+    load_ledger(df)
+    import_ms = (time.perf_counter() - started) * 1000
+
+    metrics = {"import": import_ms, **measure(df)}
+    failures = check_results(df, 0)
+
+    print(json.dumps({"metrics": metrics, "failures": failures}))
+
+
+# ---------------- COMPARE ----------------
+def backends():
+    found = {"sqlite": None}
+    if BENCH_POSTGRES_URL:
+        found["postgres"] = BENCH_POSTGRES_URL
+    return found
+
+
+def sizes():
+    return [tuple(int(v) for v in size.split(":")) for size in BENCH_SIZES.split(",") if size.strip()]
+
+
+def run_child(backend, url, rows, years):
+    env = dict(os.environ)
+    env["DATABASE_URL"] = url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run", backend, str(rows), str(years)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def load_baseline():
+    if not os.path.exists(BENCH_BASELINE):
+        return {}
+    with open(BENCH_BASELINE) as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--run"]:
+        run_one(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+        sys.exit(0)
+
+    save_baseline = "--save-baseline" in sys.argv
+    baseline = load_baseline()
+    failed = False
+
+    for backend, url in backends().items():
+        for rows, years in sizes():
+            result = run_child(backend, url, rows, years)
+            prefix = f"{backend}/{rows}x{years}y"
+
+            for name, elapsed in result["metrics"].items():
+                key = f"{prefix}/{name}"
+                previous = baseline.get(key)
+                regressed = (
+                    previous is not None and name != "import"
+                    and elapsed > previous * (1 + BENCH_TOLERANCE)
+                    and elapsed - previous > BENCH_MIN_DELTA_MS
+                )
+                failed |= regressed
+
+                reference = f"(baseline {previous:9.2f}ms)" if previous is not None else ""
+                print(f"{key:<48} {elapsed:9.2f}ms {reference}{'  REGRESSED' if regressed else ''}")
+
+                if save_baseline:
+                    baseline[key] = round(elapsed, 3)
+
+            for failure in result["failures"]:
+                failed = True
+                print(f"{prefix} WRONG RESULT {failure}")
+
+    if save_baseline:
+        with open(BENCH_BASELINE, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"baseline written to {BENCH_BASELINE}")
+
+    sys.exit(1 if failed else 0)
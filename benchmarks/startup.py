@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if not os.getenv("DATABASE_URL"):
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+sys.path.insert(0, ROOT)
+
+
+# Cold start: fresh interpreter, import what a page needs, first init_db()
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "3.0"))
+
+# Fixed cost of a rerun before page code: init_db() and a settings read
+RERUN_BUDGET_MS = float(os.getenv("RERUN_BUDGET_MS", "2.0"))
+
+RERUN_ROUNDS = 1000
+
+# Modules each page imports in app.py, on top of the shared ones
+SHARED_MODULES = ["streamlit", "pandas", "database", "analytics", "ledger"]
+PAGE_MODULES = {
+    "Dashboard": ["plotly.express", "charts"],
+    "Transactions": ["importer"],
+    "Timeline": ["charts", "snapshots"],
+    "Export": ["export"],
+    "Settings": ["reconcile"],
+}
+
+COLD_START = """
+import time
+started = time.perf_counter()
+{imports}
+import database
+database.init_db()
+print(time.perf_counter() - started)
+"""
+
+
+# ---------------- MEASURE ----------------
+def cold_start(page):
+    modules = SHARED_MODULES + PAGE_MODULES[page]
+    code = COLD_START.format(imports="\n".join(f"import {m}" for m in modules))
+
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+
+    return float(output.strip().splitlines()[-1])
+
+
+def rerun_overhead(rounds=RERUN_ROUNDS):
+    from database import init_db
+    from analytics import get_setting
+
+    init_db()
+    get_setting("starting_date")
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        init_db()
+        get_setting("starting_date")
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+if __name__ == "__main__":
+    failed = False
+
+    for page in PAGE_MODULES:
+        elapsed = cold_start(page)
+        over = elapsed > STARTUP_BUDGET_SECONDS
+        failed |= over
+        print(f"cold start {page:<13} {elapsed:7.3f}s  (budget {STARTUP_BUDGET_SECONDS:.3f}s){'  OVER' if over else ''}")
+
+    overhead = rerun_overhead()
+    over = overhead > RERUN_BUDGET_MS
+    failed |= over
+    print(f"rerun overhead         {overhead:7.3f}ms (budget {RERUN_BUDGET_MS:.3f}ms){'  OVER' if over else ''}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,101 @@
+import io
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, ROOT)
+
+
+# Fixed so the same (rows, years, seed) always yields the same ledger
+SYNTHETIC_END = date(2025, 12, 31)
+
+INCOME_SHARE = 0.08
+
+# category: (weight, lognormal mu, lognormal sigma) of the amount
+INCOME_CATEGORIES = {
+    "salary": (0.55, 7.1, 0.15),
+    "freelance": (0.25, 6.2, 0.6),
+    "refund": (0.20, 3.5, 0.8),
+}
+EXPENSE_CATEGORIES = {
+    "groceries": (0.32, 3.4, 0.6),
+    "restaurants": (0.18, 3.2, 0.5),
+    "transport": (0.15, 2.8, 0.7),
+    "shopping": (0.12, 4.0, 0.9),
+    "utilities": (0.08, 4.3, 0.3),
+    "health": (0.06, 3.9, 0.8),
+    "leisure": (0.06, 3.6, 0.8),
+    "rent": (0.03, 6.8, 0.1),
+}
+
+NOTES = np.array(["", "", "", "", "card", "transfer", "cash", "monthly"])
+
+
+# ---------------- GENERATE ----------------
+def _draw(rng, weights, count):
+    # (category, amount) pairs for `count` transactions of one type
+    names = np.array(list(weights))
+    probs = np.array([weights[name][0] for name in names])
+    picked = rng.choice(len(names), size=count, p=probs / probs.sum())
+
+    mu = np.array([weights[name][1] for name in names])[picked]
+    sigma = np.array([weights[name][2] for name in names])[picked]
+
+    return names[picked], np.maximum(rng.lognormal(mu, sigma).round(2), 0.01)
+
+
+def generate_ledger(rows, years, seed=0, end=SYNTHETIC_END):
+    # rows transactions spread uniformly over the `years` years ending on
+    # `end`, ordered by date. Deterministic for a given seed.
+    rng = np.random.default_rng(seed)
+
+    last = pd.Timestamp(end)
+    first = last - pd.DateOffset(years=years) + pd.Timedelta(days=1)
+    span = (last - first).days + 1
+
+    days = np.sort(rng.integers(0, span, size=rows))
+    is_income = rng.random(rows) < INCOME_SHARE
+
+    categories = np.empty(rows, dtype=object)
+    amounts = np.empty(rows)
+
+    categories[is_income], amounts[is_income] = _draw(rng, INCOME_CATEGORIES, is_income.sum())
+    categories[~is_income], amounts[~is_income] = _draw(rng, EXPENSE_CATEGORIES, (~is_income).sum())
+
+    return pd.DataFrame({
+        "date": (first + pd.to_timedelta(days, unit="D")).strftime("%Y-%m-%d"),
+        "type": np.where(is_income, "income", "expense"),
+        "category": categories,
+        "amount": amounts,
+        "note": NOTES[rng.integers(0, len(NOTES), size=rows)],
+    })
+
+
+# ---------------- LOAD ----------------
+def load_ledger(df, starting_balance=0, chunksize=50000, account_id=1):
+    # Into an empty database through the regular import path, so the
+    # derived tables (daily balances, snapshots, rollup) are built as in use.
+    from database import init_db
+    from analytics import set_setting
+    from ledger import set_opening_balance
+    from importer import import_csv
+
+    init_db()
+    set_setting("starting_date", df["date"].min())
+    set_opening_balance(account_id, starting_balance)
+
+    return import_csv(io.StringIO(df.to_csv(index=False)), chunksize=chunksize, account_id=account_id)
+
+
+if __name__ == "__main__":
+    # python benchmarks/synthetic.py ROWS YEARS [SEED] > ledger.csv
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    generate_ledger(rows, years, seed).to_csv(sys.stdout, index=False)
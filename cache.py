@@ -0,0 +1,199 @@
+import os
+import copy
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+# memory | streamlit | disk | none. Unset: the app uses streamlit, scripts
+# and batch jobs memory.
+ANALYTICS_CACHE = os.getenv("ANALYTICS_CACHE", "")
+
+ANALYTICS_CACHE_DIR = os.getenv("ANALYTICS_CACHE_DIR", ".analytics_cache")
+
+
+# ---------------- BACKENDS ----------------
+# A backend memoizes compute() under (name, key): name identifies the
+# cached function, key is hashable and has a stable repr (versions and
+# arguments). max_entries bounds the entries kept per name. shared entries
+# are returned as the cached object itself, for callers that never modify it.
+class NoCache:
+    kind = "none"
+
+    def call(self, name, key, compute, max_entries, shared=False):
+        return compute()
+
+    def clear(self):
+        pass
+
+
+class MemoryCache:
+    # Per-process LRU. Hits return a copy, so callers may modify the
+    # frames they get back as with st.cache_data; shared entries are not
+    # copied.
+    kind = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def call(self, name, key, compute, max_entries, shared=False):
+        with self._lock:
+            entries = self._entries.setdefault(name, OrderedDict())
+            if key in entries:
+                entries.move_to_end(key)
+                return entries[key] if shared else copy.deepcopy(entries[key])
+
+        value = compute()
+
+        with self._lock:
+            entries[key] = value if shared else copy.deepcopy(value)
+            entries.move_to_end(key)
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class StreamlitCache:
+    # st.cache_data underneath (st.cache_resource for shared entries, which
+    # skips the per-hit pickling): shared by all sessions of the app process
+    # and cleared with the rest of Streamlit's caches.
+    kind = "streamlit"
+
+    def __init__(self):
+        import streamlit as st
+
+        self._st = st
+        self._lock = threading.Lock()
+        self._functions = {}
+
+    def _function(self, name, max_entries, shared):
+        with self._lock:
+            if (name, shared) not in self._functions:
+                # arguments starting with "_" are not hashed by Streamlit
+                def cached(key, _compute):
+                    return _compute()
+
+                # Streamlit keys functions by qualname + source; one per name
+                if shared:
+                    cached.__qualname__ = f"{name}.shared"
+                    decorator = self._st.cache_resource(max_entries=max_entries, show_spinner=False)
+                else:
+                    cached.__qualname__ = f"{name}.cached"
+                    decorator = self._st.cache_data(max_entries=max_entries, show_spinner=False)
+
+                self._functions[(name, shared)] = decorator(cached)
+
+            return self._functions[(name, shared)]
+
+    def call(self, name, key, compute, max_entries, shared=False):
+        return self._function(name, max_entries, shared)(key, compute)
+
+    def clear(self):
+        self._st.cache_data.clear()
+        self._st.cache_resource.clear()
+
+
+class DiskCache:
+    # One pickle per entry under `directory`, shared by every process that
+    # points there. Keys include the data versions, which live in the
+    # database, so entries written by another process stay valid until the
+    # data changes. Only for a directory this app owns: pickles are loaded.
+    kind = "disk"
+
+    def __init__(self, directory=ANALYTICS_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name, key):
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, f"{name}-{digest}.pkl")
+
+    def call(self, name, key, compute, max_entries, shared=False):
+        path = self._path(name, key)
+
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)
+            return value
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+        value = compute()
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        self._prune(name, max_entries)
+        return value
+
+    def _prune(self, name, max_entries):
+        # least recently used first
+        paths = [
+            os.path.join(self.directory, entry)
+            for entry in os.listdir(self.directory)
+            if entry.startswith(f"{name}-") and entry.endswith(".pkl")
+        ]
+        if len(paths) <= max_entries:
+            return
+
+        paths.sort(key=lambda path: os.path.getmtime(path) if os.path.exists(path) else 0)
+        for path in paths[:len(paths) - max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        for entry in os.listdir(self.directory):
+            if entry.endswith(".pkl"):
+                try:
+                    os.remove(os.path.join(self.directory, entry))
+                except OSError:
+                    pass
+
+
+BACKENDS = {
+    "none": NoCache,
+    "memory": MemoryCache,
+    "streamlit": StreamlitCache,
+    "disk": DiskCache,
+}
+
+
+# ---------------- CURRENT BACKEND ----------------
+_backend_lock = threading.Lock()
+_backend = None
+
+
+def use_cache(kind):
+    # Selects the process-wide backend; a no-op if it is already in use,
+    # so the app can call it on every rerun.
+    global _backend
+
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown cache backend: {kind!r} (expected one of {sorted(BACKENDS)})")
+
+    with _backend_lock:
+        if _backend is None or _backend.kind != kind:
+            _backend = BACKENDS[kind]()
+        return _backend
+
+
+def get_cache():
+    if _backend is None:
+        return use_cache(ANALYTICS_CACHE or "memory")
+    return _backend
+
+
+def clear_cache():
+    get_cache().clear()
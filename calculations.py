@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+from profiling import timed
+
+
+# Pure computations over transaction frames: no database, no Streamlit,
+# ranges and settings passed in explicitly. The loaders in analytics.py
+# feed them; batch jobs can call them directly.
+
+
+# ---------------- LEDGER FRAME ----------------
+# The compact layout every computation works on: a sorted DatetimeIndex
+# named "date", categorical type and category, amounts as int64 cents.
+# Loaded once, parsed once, shared read-only.
+LEDGER_COLUMNS = ("id", "account_id", "type", "category", "amount_cents", "note")
+
+TRANSACTION_TYPES = ["expense", "income"]
+
+
+def ledger_frame(df):
+    # From a raw transactions frame (date, and any of id, account_id, type,
+    # category, amount, note) as read from SQL or a CSV
+    columns = {}
+
+    if "id" in df.columns:
+        columns["id"] = df["id"].to_numpy(dtype=np.int64)
+    if "account_id" in df.columns:
+        columns["account_id"] = df["account_id"].to_numpy(dtype=np.int64)
+    if "type" in df.columns:
+        columns["type"] = pd.Categorical(df["type"], categories=TRANSACTION_TYPES)
+    if "category" in df.columns:
+        columns["category"] = pd.Categorical(df["category"])
+    if "amount" in df.columns:
+        # NUMERIC columns come back as Decimal on Postgres
+        columns["amount_cents"] = np.rint(df["amount"].to_numpy(dtype=float) * 100).astype(np.int64)
+    if "note" in df.columns:
+        columns["note"] = df["note"].to_numpy()
+
+    index = pd.DatetimeIndex(pd.to_datetime(df["date"]), name="date")
+    frame = pd.DataFrame(columns, index=index)
+
+    if not frame.index.is_monotonic_increasing:
+        frame = frame.sort_index(kind="stable")
+    return frame
+
+
+def _daily_cents(df, t_type):
+    # Sum of amount_cents per day for one transaction type
+    cents = np.where(df["type"] == t_type, df["amount_cents"].to_numpy(), 0)
+    return pd.Series(cents, index=df.index).groupby(level=0).sum()
+
+
+# ---------------- NET WORTH TIMELINE ----------------
+def empty_timeline():
+    # Typed, so merging it into a chart frame keeps balance numeric
+    return pd.DataFrame({"date": pd.Series(dtype=object), "balance": pd.Series(dtype=float)})
+
+
+@timed()
+def compute_balance_timeline(df, starting_balance, starting_date):
+    if df.empty:
+        return empty_timeline()
+
+    # income adds, expense subtracts, in whole cents
+    daily = _daily_cents(df, "income").sub(_daily_cents(df, "expense"), fill_value=0)
+
+    start_date = pd.Timestamp(starting_date).normalize()
+    end_date = max(df.index[-1], start_date)
+
+    # transactions dated before the starting date count from its first day
+    before_start = int(daily[daily.index < start_date].sum())
+
+    all_days = pd.date_range(start=start_date, end=end_date, freq="D")
+    daily = daily.reindex(all_days, fill_value=0)
+
+    return pd.DataFrame({
+        "date": all_days.strftime("%Y-%m-%d"),
+        "balance": float(starting_balance) + (before_start + daily.cumsum().to_numpy()) / 100
+    })
+
+
+# ---------------- SUMMARIES ----------------
+@timed()
+def monthly_summary(df):
+    if df.empty:
+        return pd.DataFrame()
+
+    months = df.index.to_period("M").rename("month")
+
+    grouped = df.groupby([months, "type"], observed=True)["amount_cents"].sum().reset_index()
+    grouped["month"] = grouped["month"].astype(str)
+    grouped["type"] = grouped["type"].astype(str)
+    grouped["amount"] = grouped.pop("amount_cents") / 100
+
+    return grouped.sort_values("month", kind="stable")
+
+
+@timed()
+def period_series(df, start, end, cumulative=False):
+    # Income and expense per day of [start, end), zero on days without
+    # transactions, optionally as running totals. Feeds the Dashboard chart.
+    all_days = pd.date_range(start=start, end=end - pd.Timedelta(days=1), freq="D")
+
+    income = _daily_cents(df, "income").reindex(all_days, fill_value=0)
+    expense = _daily_cents(df, "expense").reindex(all_days, fill_value=0)
+
+    if cumulative:
+        income = income.cumsum()
+        expense = expense.cumsum()
+
+    return pd.DataFrame({
+        "date": all_days.date,
+        "income": income.to_numpy() / 100,
+        "expense": expense.to_numpy() / 100
+    })
@@ -0,0 +1,100 @@
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+
+# Points per trace sent to the browser; longer series are downsampled
+CHART_MAX_POINTS = int(os.getenv("CHART_MAX_POINTS", "1500"))
+
+# From this many points per trace on, render with WebGL instead of SVG
+CHART_WEBGL_POINTS = int(os.getenv("CHART_WEBGL_POINTS", "1000"))
+
+# Markers only on short series (a year of days), they dominate render time
+CHART_MARKER_POINTS = int(os.getenv("CHART_MARKER_POINTS", "400"))
+
+
+# ---------------- DOWNSAMPLING ----------------
+def lttb_indices(x, y, threshold):
+    # Largest-Triangle-Three-Buckets: keeps the first and last point and, per
+    # bucket, the point forming the largest triangle with the previous pick
+    # and the next bucket's average, so peaks and dips survive.
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+
+        if i + 2 < len(edges):
+            next_end = edges[i + 2]
+            avg_x = x[end:next_end].mean()
+            avg_y = y[end:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+
+    return selected
+
+
+def downsample(df, x, y_cols, max_points=CHART_MAX_POINTS):
+    # Rows kept by LTTB for any of the y columns, plus each column's overall
+    # minimum and maximum, in order. The result is bounded by the number of
+    # columns and max_points whatever the history length.
+    if len(df) <= max_points:
+        return df
+
+    x_values = pd.to_datetime(df[x]).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+    picks = []
+    for column in y_cols:
+        values = df[column].to_numpy(dtype=float)
+        picks.append(lttb_indices(x_values, values, max_points))
+        picks.append(np.array([values.argmin(), values.argmax()]))
+
+    keep = np.unique(np.concatenate(picks))
+
+    return df.iloc[keep]
+
+
+# ---------------- FIGURES ----------------
+def line_chart(df, x, y, title, max_points=CHART_MAX_POINTS):
+    # px.line with a bounded payload: downsampled long series on a date
+    # axis, WebGL traces for large ones, markers only on short ones.
+    y_cols = [y] if isinstance(y, str) else list(y)
+
+    plotted = downsample(df, x, y_cols, max_points)
+    points = len(plotted)
+
+    fig = px.line(
+        plotted,
+        x=x,
+        y=y,
+        markers=points <= CHART_MARKER_POINTS,
+        title=title,
+        render_mode="webgl" if points >= CHART_WEBGL_POINTS else "svg"
+    )
+
+    # a category axis would space the kept points evenly and distort time
+    if points == len(df):
+        fig.update_xaxes(type="category")
+    else:
+        fig.update_xaxes(type="date")
+
+    return fig
@@ -1,5 +1,20 @@
 import os
-from sqlalchemy import create_engine, text
+import time
+import bisect
+import hashlib
+import secrets
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, text, event, inspect
+from sqlalchemy.exc import OperationalError
+from profiling import instrument_engine
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process migration lock
+    fcntl = None
 
 # ---------------- DATABASE URL ----------------
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -12,12 +27,98 @@ if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
 if not DATABASE_URL:
     DATABASE_URL = "sqlite:///networth.db"
 
+# ---------------- CONNECTION POOL ----------------
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+
+# ---------------- SQLITE TUNING ----------------
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+# ---------------- MAINTENANCE ----------------
+DB_MAINTENANCE_INTERVAL_HOURS = float(os.getenv("DB_MAINTENANCE_INTERVAL_HOURS", "24"))
+DB_MAINTENANCE_VACUUM = os.getenv("DB_MAINTENANCE_VACUUM", "1") == "1"
+
 # Create engine
-engine = create_engine(DATABASE_URL, echo=False)
+if DATABASE_URL.startswith("sqlite"):
+    engine = create_engine(
+        DATABASE_URL,
+        echo=False,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        connect_args={"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+    )
 
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, connection_record):
+        # WAL lets readers run while a Streamlit session writes
+        cursor = dbapi_conn.cursor()
+        cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+else:
+    engine = create_engine(
+        DATABASE_URL,
+        echo=False,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING
+    )
 
-# ---------------- INIT DB ----------------
-def init_db():
+# Query timings for the debug panel and PROFILE_LOG
+instrument_engine(engine)
+
+
+# ---------------- AMOUNTS ----------------
+# transactions.amount is exact on both databases: NUMERIC(14, 2) on
+# Postgres, whole cents in an INTEGER column on SQLite, whose NUMERIC is
+# stored as REAL (migration 9). SQL reads it in currency units through
+# amount_sql(); values written to it go through to_db_amount().
+AMOUNT_IN_CENTS = engine.dialect.name == "sqlite"
+
+
+def amount_sql(expr="amount"):
+    # expr over the stored column, e.g. "SUM(amount)", in currency units;
+    # sums of cents are exact, the division comes last
+    return f"({expr}) / 100.0" if AMOUNT_IN_CENTS else expr
+
+
+def db_amount_sql(expr):
+    # The reverse: a currency-units SQL expression as it is stored
+    return f"CAST(ROUND(({expr}) * 100) AS INTEGER)" if AMOUNT_IN_CENTS else expr
+
+
+def to_db_amount(value):
+    cents = round(float(value) * 100)
+    return int(cents) if AMOUNT_IN_CENTS else cents / 100
+
+
+def transaction_columns_sql(columns):
+    # A SELECT list over transactions with the amount in currency units
+    return ", ".join(f"{amount_sql()} AS amount" if column == "amount" else column for column in columns)
+
+
+# ---------------- MIGRATIONS ----------------
+# Each migration runs once, in order, and records its number in schema_version.
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "5000"))
+MIGRATION_LOCK_KEY = 7263041
+
+VERSIONED_TABLES = ("transactions", "snapshots", "balance", "settings", "daily_balances", "monthly_rollup")
+
+
+def _migration_1_base_schema():
     with engine.begin() as conn:
 
         # TRANSACTIONS
@@ -49,6 +150,16 @@ def init_db():
         )
         """))
 
+        # DAILY BALANCES (maintained from transactions)
+        conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS daily_balances (
+            date DATE PRIMARY KEY,
+            income DOUBLE PRECISION,
+            expense DOUBLE PRECISION,
+            closing_balance DOUBLE PRECISION
+        )
+        """))
+
         # SETTINGS
         conn.execute(text("""
         CREATE TABLE IF NOT EXISTS settings (
@@ -79,4 +190,688 @@ def init_db():
         if check_starting_date == 0:
             conn.execute(
                 text("INSERT INTO settings (key, value) VALUES ('starting_date', '2026-01-01')")
-            )
\ No newline at end of file
+            )
+
+
+def _migration_2_typed_transactions():
+    # date TEXT -> DATE, amount DOUBLE -> NUMERIC(14,2), plus the lookup indexes.
+    # On Postgres rows are copied in id batches, each in its own transaction,
+    # so a large ledger never sits in one giant transaction.
+    if engine.dialect.name == "sqlite":
+        _retype_transactions_sqlite()
+    else:
+        _retype_transactions_postgres()
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_transactions_date ON transactions (date)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_transactions_type_date ON transactions (type, date)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_transactions_category_date ON transactions (category, date)"
+        ))
+
+
+def _batch_bounds(conn, key, table):
+    row = conn.execute(text(f"SELECT MIN({key}), MAX({key}) FROM {table}")).fetchone()
+    if row[0] is None:
+        return
+    low, high = int(row[0]), int(row[1])
+    for start in range(low - 1, high, MIGRATION_BATCH_SIZE):
+        yield start, start + MIGRATION_BATCH_SIZE
+
+
+@contextmanager
+def write_transaction():
+    # engine.begin() holding SQLite's write lock from the first statement
+    # (BEGIN IMMEDIATE). pysqlite only opens a transaction on its own before
+    # INSERT/UPDATE/DELETE, so a DROP or RENAME would commit alone, and a
+    # transaction that reads before it writes fails at once with "database
+    # is locked" when another writer got in between; this one waits instead.
+    if engine.dialect.name != "sqlite":
+        with engine.begin() as conn:
+            yield conn
+        return
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        yield conn
+        conn.commit()
+
+
+def _retype_transactions_sqlite():
+    # SQLite cannot change a column type, so the table is rebuilt. The old
+    # "id SERIAL" column was not a rowid alias and left ids NULL; inserting
+    # NULL into the new INTEGER PRIMARY KEY assigns them. The copy, DROP and
+    # RENAME are one transaction, so no row written meanwhile is lost.
+    with write_transaction() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS transactions_migrating"))
+        conn.execute(text("""
+        CREATE TABLE transactions_migrating (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date DATE,
+            type TEXT,
+            category TEXT,
+            amount NUMERIC(14, 2),
+            note TEXT
+        )
+        """))
+        conn.execute(text("""
+            INSERT INTO transactions_migrating (id, date, type, category, amount, note)
+            SELECT id, COALESCE(date(date), date), type, category, ROUND(amount, 2), note
+            FROM transactions
+            ORDER BY rowid
+        """))
+        conn.execute(text("DROP TABLE transactions"))
+        conn.execute(text("ALTER TABLE transactions_migrating RENAME TO transactions"))
+
+
+def _retype_transactions_postgres():
+    with engine.begin() as conn:
+        conn.execute(text("""
+            ALTER TABLE transactions
+            ADD COLUMN IF NOT EXISTS date_typed DATE,
+            ADD COLUMN IF NOT EXISTS amount_typed NUMERIC(14, 2)
+        """))
+
+    copy_sql = text("""
+        UPDATE transactions
+        SET date_typed = CAST(NULLIF(date, '') AS DATE),
+            amount_typed = ROUND(CAST(amount AS NUMERIC), 2)
+        WHERE id > :low AND id <= :high
+    """)
+
+    with engine.connect() as conn:
+        batches = list(_batch_bounds(conn, "id", "transactions"))
+
+    for low, high in batches:
+        with engine.begin() as conn:
+            conn.execute(copy_sql, {"low": low, "high": high})
+
+    with engine.begin() as conn:
+        # catch rows written while the batches were running
+        conn.execute(text("""
+            UPDATE transactions
+            SET date_typed = CAST(NULLIF(date, '') AS DATE),
+                amount_typed = ROUND(CAST(amount AS NUMERIC), 2)
+            WHERE date_typed IS NULL AND amount_typed IS NULL
+        """))
+        conn.execute(text("ALTER TABLE transactions DROP COLUMN date"))
+        conn.execute(text("ALTER TABLE transactions DROP COLUMN amount"))
+        conn.execute(text("ALTER TABLE transactions RENAME COLUMN date_typed TO date"))
+        conn.execute(text("ALTER TABLE transactions RENAME COLUMN amount_typed TO amount"))
+
+
+def _migration_3_data_versions():
+    # One counter per table; writers bump it, cached loaders key on it.
+    with engine.begin() as conn:
+        conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+        """))
+
+        for name in VERSIONED_TABLES:
+            conn.execute(
+                text("""
+                INSERT INTO data_versions (name, version)
+                VALUES (:name, 0)
+                ON CONFLICT (name) DO NOTHING
+                """),
+                {"name": name}
+            )
+
+
+# ---------------- CONTENT HASH ----------------
+# Identifies a transaction by its content. The occurrence number keeps two
+# genuinely identical rows (same day, same amount, same note) distinct, so
+# re-importing a file is idempotent without merging real duplicates.
+def content_key(t_date, t_type, category, amount, note):
+    return "|".join([
+        str(t_date)[:10],
+        t_type or "",
+        category or "",
+        f"{float(amount):.2f}",
+        note or ""
+    ])
+
+
+def content_hashes(keys, occurrences=None):
+    occurrences = Counter() if occurrences is None else occurrences
+    hashes = []
+
+    for key in keys:
+        hashes.append(hashlib.sha1(f"{key}|{occurrences[key]}".encode("utf-8")).hexdigest())
+        occurrences[key] += 1
+
+    return hashes
+
+
+def _migration_4_content_hash():
+    columns = {col["name"] for col in inspect(engine).get_columns("transactions")}
+
+    if "content_hash" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE transactions ADD COLUMN content_hash TEXT"))
+
+    occurrences = Counter()
+
+    with engine.connect() as conn:
+        batches = list(_batch_bounds(conn, "id", "transactions"))
+
+    for low, high in batches:
+        with engine.begin() as conn:
+            rows = conn.execute(text("""
+                SELECT id, date, type, category, amount, note
+                FROM transactions
+                WHERE id > :low AND id <= :high
+                ORDER BY id
+            """), {"low": low, "high": high}).fetchall()
+
+            if not rows:
+                continue
+
+            hashes = content_hashes([content_key(*row[1:]) for row in rows], occurrences)
+            conn.execute(
+                text("UPDATE transactions SET content_hash=:content_hash WHERE id=:id"),
+                [{"id": row[0], "content_hash": h} for row, h in zip(rows, hashes)]
+            )
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_transactions_content_hash ON transactions (content_hash)"
+        ))
+
+
+def _migration_5_covering_date_index():
+    # Daily aggregates (timeline, reconciliation, totals) only read date, type
+    # and amount; with all three in the index they never touch the table.
+    # It also serves every lookup the plain (date) index did.
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_transactions_date_type_amount "
+            "ON transactions (date, type, amount)"
+        ))
+        conn.execute(text("DROP INDEX IF EXISTS ix_transactions_date"))
+
+
+def _migration_6_monthly_rollup():
+    # Sum and count per month, type and category. Ledger writes keep it
+    # current with deltas; it is backfilled here so it is never partial.
+    if engine.dialect.name == "sqlite":
+        month = "substr(date, 1, 7)"
+    else:
+        month = "to_char(date, 'YYYY-MM')"
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS monthly_rollup (
+            month TEXT NOT NULL,
+            type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            amount NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            tx_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, type, category)
+        )
+        """))
+
+        conn.execute(text("DELETE FROM monthly_rollup"))
+        conn.execute(text(f"""
+        INSERT INTO monthly_rollup (month, type, category, amount, tx_count)
+        SELECT {month}, type, COALESCE(category, ''), SUM(amount), COUNT(*)
+        FROM transactions
+        GROUP BY {month}, type, COALESCE(category, '')
+        """))
+
+        conn.execute(text("""
+        INSERT INTO data_versions (name, version)
+        VALUES ('monthly_rollup', 0)
+        ON CONFLICT (name) DO NOTHING
+        """))
+
+
+def _migration_7_keyset_index():
+    # Keyset pagination of the transactions grid orders and seeks on
+    # (date, id); with both in one index every page is a range scan.
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_transactions_date_id "
+            "ON transactions (date, id)"
+        ))
+
+
+def _migration_8_accounts():
+    # Every row of the balance table becomes an account (row 1 holds the
+    # existing ledger), transactions get an account_id, and the derived
+    # tables are keyed per account so each account is maintained, cached
+    # and reconciled on its own. The global starting balance becomes the
+    # opening balance of account 1; the starting date stays global.
+    balance_columns = {col["name"] for col in inspect(engine).get_columns("balance")}
+    transaction_columns = {col["name"] for col in inspect(engine).get_columns("transactions")}
+
+    with engine.begin() as conn:
+        if "name" not in balance_columns:
+            conn.execute(text("ALTER TABLE balance ADD COLUMN name TEXT"))
+        if "opening_balance" not in balance_columns:
+            conn.execute(text(
+                "ALTER TABLE balance ADD COLUMN opening_balance DOUBLE PRECISION NOT NULL DEFAULT 0"
+            ))
+
+        starting_balance = conn.execute(
+            text("SELECT value FROM settings WHERE key='starting_balance'")
+        ).scalar()
+
+        # amount used to hold the ledger alone (the Dashboard added the
+        # starting balance on top); it now means opening + ledger. The
+        # setting is deleted in the same transaction, so a re-run finds
+        # none and leaves the opening balance and amount alone.
+        if starting_balance is not None:
+            conn.execute(
+                text("""
+                UPDATE balance
+                SET opening_balance=:opening, amount = COALESCE(amount, 0) + :opening
+                WHERE id=1
+                """),
+                {"opening": float(starting_balance or 0)}
+            )
+            conn.execute(text("DELETE FROM settings WHERE key='starting_balance'"))
+
+        conn.execute(text("UPDATE balance SET name='Capital' WHERE id=1 AND name IS NULL"))
+        conn.execute(text("UPDATE balance SET name='Account ' || id WHERE name IS NULL"))
+
+        if "account_id" not in transaction_columns:
+            conn.execute(text(
+                "ALTER TABLE transactions ADD COLUMN account_id INTEGER NOT NULL DEFAULT 1"
+            ))
+
+        # per-account versions of the covering and keyset indexes; the
+        # global ones still serve the consolidated views
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_transactions_account_date_type_amount "
+            "ON transactions (account_id, date, type, amount)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_transactions_account_date_id "
+            "ON transactions (account_id, date, id)"
+        ))
+
+        # the same file imported into two accounts is two sets of rows
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_transactions_account_content_hash "
+            "ON transactions (account_id, content_hash)"
+        ))
+        conn.execute(text("DROP INDEX IF EXISTS ux_transactions_content_hash"))
+
+    if engine.dialect.name == "sqlite":
+        snapshot_id = "INTEGER PRIMARY KEY AUTOINCREMENT"
+    else:
+        snapshot_id = "SERIAL PRIMARY KEY"
+
+    # the derived tables are small (one row per day or month), so they are
+    # rebuilt in one go with the existing rows assigned to account 1
+    _partition_by_account("daily_balances", """
+        CREATE TABLE {table} (
+            account_id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            income DOUBLE PRECISION,
+            expense DOUBLE PRECISION,
+            closing_balance DOUBLE PRECISION,
+            PRIMARY KEY (account_id, date)
+        )
+    """, ["date", "income", "expense", "closing_balance"])
+
+    _partition_by_account("snapshots", f"""
+        CREATE TABLE {{table}} (
+            id {snapshot_id},
+            account_id INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            networth DOUBLE PRECISION,
+            UNIQUE (account_id, date)
+        )
+    """, ["date", "networth"])
+
+    _partition_by_account("monthly_rollup", """
+        CREATE TABLE {table} (
+            account_id INTEGER NOT NULL,
+            month TEXT NOT NULL,
+            type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            amount NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            tx_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (account_id, month, type, category)
+        )
+    """, ["month", "type", "category", "amount", "tx_count"])
+
+    _recompute_snapshots()
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+        UPDATE data_versions SET version = version + 1
+        WHERE name IN ('balance', 'settings', 'daily_balances', 'snapshots', 'monthly_rollup')
+        """))
+
+
+def _recompute_snapshots():
+    # Snapshots saved by older versions hold the balance row, i.e. the
+    # ledger without the starting balance. Each one becomes account 1's
+    # opening balance plus every transaction up to its date, as
+    # snapshots.py computes them now. Idempotent, so safe to re-run.
+    with engine.begin() as conn:
+        opening = float(conn.execute(text("SELECT opening_balance FROM balance WHERE id=1")).scalar() or 0)
+        daily = conn.execute(text("""
+            SELECT date, SUM(CASE WHEN type = 'income' THEN amount
+                                  WHEN type = 'expense' THEN -amount
+                                  ELSE 0 END)
+            FROM transactions
+            WHERE account_id = 1
+            GROUP BY date
+            ORDER BY date
+        """)).fetchall()
+
+        days, totals, total = [], [], 0.0
+        for day, delta in daily:
+            total += float(delta or 0)
+            days.append(str(day)[:10])
+            totals.append(total)
+
+        updates = []
+        for (snapshot_date,) in conn.execute(text("SELECT date FROM snapshots WHERE account_id = 1")):
+            position = bisect.bisect_right(days, str(snapshot_date)[:10])
+            networth = opening + (totals[position - 1] if position else 0.0)
+            updates.append({"date": snapshot_date, "networth": round(networth, 2)})
+
+        if updates:
+            conn.execute(
+                text("UPDATE snapshots SET networth=:networth WHERE account_id = 1 AND date=:date"),
+                updates
+            )
+
+
+def _partition_by_account(table, create_sql, columns):
+    columns = ", ".join(columns)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {table}_migrating"))
+        conn.execute(text(create_sql.format(table=f"{table}_migrating")))
+        conn.execute(text(f"""
+            INSERT INTO {table}_migrating (account_id, {columns})
+            SELECT 1, {columns} FROM {table}
+        """))
+        conn.execute(text(f"DROP TABLE {table}"))
+        conn.execute(text(f"ALTER TABLE {table}_migrating RENAME TO {table}"))
+
+
+def _migration_9_sqlite_amount_cents():
+    # SQLite keeps NUMERIC(14, 2) values as REAL, so amounts there were
+    # floats. The table is rebuilt with amount as INTEGER cents in one
+    # transaction; its indexes are recreated from their stored SQL. A
+    # column already declared INTEGER was converted by an earlier run.
+    if engine.dialect.name != "sqlite":
+        return
+
+    amount_type = {col["name"]: str(col["type"]) for col in inspect(engine).get_columns("transactions")}["amount"]
+    if amount_type == "INTEGER":
+        return
+
+    with write_transaction() as conn:
+        indexes = conn.execute(text(
+            "SELECT sql FROM sqlite_master WHERE type='index' AND tbl_name='transactions' AND sql IS NOT NULL"
+        )).scalars().all()
+        sequence = conn.execute(
+            text("SELECT seq FROM sqlite_sequence WHERE name='transactions'")
+        ).scalar()
+
+        conn.execute(text("DROP TABLE IF EXISTS transactions_migrating"))
+        conn.execute(text("""
+        CREATE TABLE transactions_migrating (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date DATE,
+            type TEXT,
+            category TEXT,
+            amount INTEGER,
+            note TEXT,
+            content_hash TEXT,
+            account_id INTEGER NOT NULL DEFAULT 1
+        )
+        """))
+        conn.execute(text("""
+            INSERT INTO transactions_migrating
+                (id, date, type, category, amount, note, content_hash, account_id)
+            SELECT id, date, type, category, CAST(ROUND(amount * 100) AS INTEGER),
+                   note, content_hash, account_id
+            FROM transactions
+            ORDER BY id
+        """))
+        conn.execute(text("DROP TABLE transactions"))
+        conn.execute(text("ALTER TABLE transactions_migrating RENAME TO transactions"))
+
+        for index_sql in indexes:
+            conn.execute(text(index_sql))
+
+        # ids of deleted rows stay retired
+        if sequence is not None:
+            conn.execute(
+                text("UPDATE sqlite_sequence SET seq = MAX(seq, :seq) WHERE name='transactions'"),
+                {"seq": int(sequence)}
+            )
+
+        conn.execute(text("""
+        UPDATE data_versions SET version = version + 1
+        WHERE name = 'transactions' OR name LIKE 'transactions@%'
+        """))
+
+
+def _migration_10_instance_id():
+    # A random id for this database, kept next to the data versions: a
+    # reset or a different database pointed at the same disk cache starts
+    # its counters over, and the id keeps their cache keys apart.
+    with engine.begin() as conn:
+        conn.execute(
+            text("""
+            INSERT INTO data_versions (name, version)
+            VALUES ('instance', :instance)
+            ON CONFLICT (name) DO NOTHING
+            """),
+            {"instance": secrets.randbelow(2 ** 31 - 1) + 1}
+        )
+
+
+def _migration_11_account_ids():
+    # New accounts take their id from the database, so two concurrent
+    # creates cannot pick the same one. SQLite's INTEGER PRIMARY KEY already
+    # does; on Postgres the column becomes an identity column that starts
+    # after the existing accounts.
+    if engine.dialect.name != "postgresql":
+        return
+
+    with engine.begin() as conn:
+        is_identity = conn.execute(text("""
+            SELECT is_identity FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'balance' AND column_name = 'id'
+        """)).scalar()
+
+        if is_identity != "YES":
+            conn.execute(text("ALTER TABLE balance ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY"))
+
+        conn.execute(text("""
+            SELECT setval(pg_get_serial_sequence('balance', 'id'), (SELECT COALESCE(MAX(id), 0) + 1 FROM balance), false)
+        """))
+
+
+MIGRATIONS = [
+    (1, _migration_1_base_schema),
+    (2, _migration_2_typed_transactions),
+    (3, _migration_3_data_versions),
+    (4, _migration_4_content_hash),
+    (5, _migration_5_covering_date_index),
+    (6, _migration_6_monthly_rollup),
+    (7, _migration_7_keyset_index),
+    (8, _migration_8_accounts),
+    (9, _migration_9_sqlite_amount_cents),
+    (10, _migration_10_instance_id),
+    (11, _migration_11_account_ids),
+]
+
+
+def get_schema_version():
+    with engine.begin() as conn:
+        conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER NOT NULL
+        )
+        """))
+        row = conn.execute(text("SELECT MAX(version) FROM schema_version")).fetchone()
+    return int(row[0]) if row and row[0] is not None else 0
+
+
+@contextmanager
+def _migration_lock():
+    # Keeps concurrent processes (the app and the start.sh scripts) from
+    # running the same migration twice: an advisory lock on Postgres, an
+    # exclusive lock on a file next to the database on SQLite.
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as lock_conn:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            try:
+                yield
+            finally:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        return
+
+    path = engine.url.database
+    if fcntl is None or not path or path == ":memory:":
+        yield
+        return
+
+    with open(f"{path}.migrate.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def migrate():
+    # Runs under _migration_lock, and the version is read again once it is
+    # held. An up-to-date schema skips the lock.
+    if get_schema_version() >= MIGRATIONS[-1][0]:
+        return
+
+    with _migration_lock():
+        current = get_schema_version()
+
+        for version, migration in MIGRATIONS:
+            if version <= current:
+                continue
+
+            migration()
+
+            with engine.begin() as conn:
+                conn.execute(
+                    text("INSERT INTO schema_version (version) VALUES (:version)"),
+                    {"version": version}
+                )
+
+
+# ---------------- MAINTENANCE ----------------
+# start.sh runs it before the app starts (python database.py maintain);
+# a long-running app process starts it in a background thread when due.
+_next_maintenance_check = 0.0
+_maintenance_lock = threading.Lock()
+
+
+def run_maintenance():
+    # ANALYZE keeps the planner statistics fresh, VACUUM reclaims space left
+    # by deletes. Both must run outside a transaction.
+    try:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if engine.dialect.name == "sqlite":
+                conn.execute(text("ANALYZE"))
+                conn.execute(text("PRAGMA optimize"))
+                if DB_MAINTENANCE_VACUUM:
+                    conn.execute(text("VACUUM"))
+                conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+            else:
+                if DB_MAINTENANCE_VACUUM:
+                    conn.execute(text("VACUUM (ANALYZE)"))
+                else:
+                    conn.execute(text("ANALYZE"))
+    except OperationalError:
+        # database busy: try again at the next scheduled check
+        return False
+
+    with engine.begin() as conn:
+        conn.execute(
+            text("""
+            INSERT INTO settings (key, value)
+            VALUES ('last_maintenance', :value)
+            ON CONFLICT (key) DO UPDATE SET value=:value
+            """),
+            {"value": datetime.now().isoformat(timespec="seconds")}
+        )
+
+    return True
+
+
+def _run_maintenance_in_background():
+    # one run per process at a time; a run still in progress skips this one
+    if not _maintenance_lock.acquire(blocking=False):
+        return
+
+    try:
+        run_maintenance()
+    finally:
+        _maintenance_lock.release()
+
+
+def maybe_run_maintenance():
+    # Only the due check runs on the caller's thread; VACUUM and ANALYZE
+    # never hold up a page load.
+    global _next_maintenance_check
+
+    if DB_MAINTENANCE_INTERVAL_HOURS <= 0 or time.monotonic() < _next_maintenance_check:
+        return False
+
+    # at most one settings lookup per process every few minutes
+    _next_maintenance_check = time.monotonic() + 300
+
+    with engine.connect() as conn:
+        row = conn.execute(
+            text("SELECT value FROM settings WHERE key='last_maintenance'")
+        ).fetchone()
+
+    if row and datetime.now() - datetime.fromisoformat(row[0]) < timedelta(hours=DB_MAINTENANCE_INTERVAL_HOURS):
+        return False
+
+    threading.Thread(target=_run_maintenance_in_background, name="db-maintenance", daemon=True).start()
+    return True
+
+
+# ---------------- INIT DB ----------------
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def init_db():
+    # app.py calls this on every rerun; the schema is checked once per
+    # process and maintenance only when due, in the background.
+    global _initialized
+
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                migrate()
+                _initialized = True
+
+    maybe_run_maintenance()
+
+
+if __name__ == "__main__":
+    import sys
+
+    migrate()
+    if "maintain" in sys.argv[1:]:
+        run_maintenance()
@@ -0,0 +1,94 @@
+import io
+import os
+import csv
+import sys
+import tempfile
+
+from sqlalchemy import text
+
+from database import engine, init_db, transaction_columns_sql
+from analytics import ensure_daily_balances
+from snapshots import ensure_snapshots
+
+
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "5000"))
+EXPORT_SPOOL_BYTES = int(os.getenv("EXPORT_SPOOL_BYTES", str(8 * 1024 * 1024)))
+
+# name -> (query, money columns formatted with two decimals)
+EXPORTS = {
+    "transactions": (
+        f"SELECT {transaction_columns_sql(('id', 'account_id', 'date', 'type', 'category', 'amount', 'note'))} "
+        "FROM transactions "
+        "ORDER BY date ASC, id ASC",
+        {"amount"}
+    ),
+    "snapshots": (
+        "SELECT id, account_id, date, networth FROM snapshots ORDER BY date ASC, account_id ASC",
+        {"networth"}
+    ),
+    "timeline": (
+        "SELECT account_id, date, closing_balance AS balance FROM daily_balances "
+        "ORDER BY date ASC, account_id ASC",
+        {"balance"}
+    ),
+}
+
+
+# ---------------- STREAMING CSV ----------------
+def iter_csv(name, chunk_rows=EXPORT_CHUNK_ROWS):
+    # Yields the CSV as UTF-8 byte chunks. Rows come from a server-side
+    # cursor chunk_rows at a time, so memory does not grow with the table.
+    query, money_columns = EXPORTS[name]
+
+    if name == "timeline":
+        ensure_daily_balances()
+    elif name == "snapshots":
+        ensure_snapshots()
+
+    with engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True,
+            yield_per=chunk_rows
+        ).execute(text(query))
+
+        columns = list(result.keys())
+        money = [i for i, column in enumerate(columns) if column in money_columns]
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(columns)
+
+        for rows in result.partitions(chunk_rows):
+            for row in rows:
+                row = list(row)
+                for i in money:
+                    if row[i] is not None:
+                        row[i] = f"{float(row[i]):.2f}"
+                writer.writerow(row)
+
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+
+def export_file(name):
+    # Bytes for st.download_button. The CSV is assembled in memory up to
+    # EXPORT_SPOOL_BYTES, then in a temporary file that is removed on return;
+    # download_button still holds the whole file in memory once it is read.
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES) as spool:
+        for chunk in iter_csv(name):
+            spool.write(chunk)
+
+        spool.seek(0)
+        return spool.read()
+
+
+if __name__ == "__main__":
+    init_db()
+
+    name = sys.argv[1] if len(sys.argv) > 1 else "transactions"
+    for chunk in iter_csv(name):
+        sys.stdout.buffer.write(chunk)
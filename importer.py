@@ -0,0 +1,160 @@
+import io
+import os
+import sys
+from collections import Counter
+
+import pandas as pd
+from sqlalchemy import text
+
+from database import engine, init_db, content_key, content_hashes, amount_sql, db_amount_sql
+from analytics import DEFAULT_ACCOUNT_ID, apply_rollup_delta
+from ledger import apply_balance_delta, refresh_derived, signed_amount
+
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "10000"))
+
+STAGING_COLUMNS = ["date", "type", "category", "amount", "note", "content_hash"]
+
+
+# ---------------- NORMALIZE ----------------
+def normalize_chunk(chunk):
+    # Accepts date, amount and optionally type, category, note. Without a
+    # type column the sign of the amount decides: negative is an expense.
+    chunk = chunk.rename(columns=lambda c: str(c).strip().lower())
+
+    missing = {"date", "amount"} - set(chunk.columns)
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {sorted(missing)}")
+
+    amounts = pd.to_numeric(chunk["amount"], errors="raise").astype(float)
+
+    if "type" in chunk.columns:
+        types = chunk["type"].astype(str).str.strip().str.lower()
+    else:
+        types = pd.Series("income", index=chunk.index).where(amounts >= 0, "expense")
+
+    invalid = ~types.isin(["income", "expense"])
+    if invalid.any():
+        raise ValueError(f"Invalid transaction type: {types[invalid].iloc[0]!r}")
+
+    rows = pd.DataFrame({
+        "date": pd.to_datetime(chunk["date"]).dt.strftime("%Y-%m-%d"),
+        "type": types,
+        "category": (
+            chunk["category"].fillna("other").astype(str).str.strip().str.lower()
+            if "category" in chunk.columns else "other"
+        ),
+        "amount": amounts.abs().round(2),
+        "note": chunk["note"].fillna("").astype(str) if "note" in chunk.columns else ""
+    })
+
+    return rows.reset_index(drop=True)
+
+
+# ---------------- STAGING ----------------
+def _stage_rows(conn, rows):
+    conn.execute(text("""
+        CREATE TEMPORARY TABLE IF NOT EXISTS import_staging (
+            date DATE,
+            type TEXT,
+            category TEXT,
+            amount NUMERIC(14, 2),
+            note TEXT,
+            content_hash TEXT
+        )
+    """))
+    conn.execute(text("DELETE FROM import_staging"))
+
+    if engine.dialect.driver == "psycopg2":
+        buffer = io.StringIO()
+        rows[STAGING_COLUMNS].to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+
+        cursor = conn.connection.cursor()
+        cursor.copy_expert(
+            f"COPY import_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN "
+            "WITH (FORMAT csv, FORCE_NOT_NULL (category, note))",
+            buffer
+        )
+        cursor.close()
+    else:
+        conn.execute(
+            text("""
+            INSERT INTO import_staging (date, type, category, amount, note, content_hash)
+            VALUES (:date, :type, :category, :amount, :note, :content_hash)
+            """),
+            rows[STAGING_COLUMNS].to_dict("records")
+        )
+
+
+def _insert_batch(rows, account_id):
+    # One DB transaction per batch: stage, insert the rows whose hash is new
+    # in the account, then apply the rollup and balance deltas once. The
+    # daily balances and snapshots are refreshed after it commits.
+    with engine.begin() as conn:
+        _stage_rows(conn, rows)
+
+        inserted = conn.execute(text(f"""
+            INSERT INTO transactions (account_id, date, type, category, amount, note, content_hash)
+            SELECT :account_id, s.date, s.type, s.category, {db_amount_sql("s.amount")}, s.note, s.content_hash
+            FROM import_staging s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM transactions t
+                WHERE t.account_id = :account_id AND t.content_hash = s.content_hash
+            )
+            ON CONFLICT (account_id, content_hash) DO NOTHING
+            RETURNING date, type, {amount_sql()}, category
+        """), {"account_id": int(account_id)}).fetchall()
+
+        if not inserted:
+            return 0
+
+        delta = sum(signed_amount(t_type, amount) for _, t_type, amount, _ in inserted)
+        first_date = min(str(t_date)[:10] for t_date, _, _, _ in inserted)
+
+        apply_rollup_delta(conn, [
+            (account_id, t_date, t_type, category, amount, 1)
+            for t_date, t_type, amount, category in inserted
+        ])
+        apply_balance_delta(conn, delta, account_id)
+
+    refresh_derived({account_id: first_date})
+    return len(inserted)
+
+
+# ---------------- IMPORT ----------------
+def import_csv(source, chunksize=IMPORT_CHUNK_SIZE, account_id=DEFAULT_ACCOUNT_ID):
+    # source: a path or a file-like object, imported into one account. Rows
+    # are read, hashed and inserted chunk by chunk so memory stays bounded
+    # by the chunk size.
+    occurrences = Counter()
+    total = inserted = 0
+
+    for chunk in pd.read_csv(source, chunksize=chunksize, dtype=str, skipinitialspace=True):
+        rows = normalize_chunk(chunk)
+
+        keys = [
+            content_key(*values)
+            for values in rows[["date", "type", "category", "amount", "note"]].itertuples(index=False)
+        ]
+        rows["content_hash"] = content_hashes(keys, occurrences)
+
+        total += len(rows)
+        inserted += _insert_batch(rows, account_id)
+
+    return {"inserted": inserted, "skipped": total - inserted}
+
+
+if __name__ == "__main__":
+    init_db()
+
+    # python importer.py [--account ID] FILE...
+    paths = sys.argv[1:]
+    account_id = DEFAULT_ACCOUNT_ID
+    if paths[:1] == ["--account"]:
+        account_id = int(paths[1])
+        paths = paths[2:]
+
+    for path in paths:
+        result = import_csv(path, account_id=account_id)
+        print(f"{path}: {result['inserted']} imported, {result['skipped']} duplicates skipped")
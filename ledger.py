@@ -0,0 +1,282 @@
+from sqlalchemy import text, bindparam
+
+from database import engine, write_transaction, amount_sql, to_db_amount
+from analytics import (
+    DEFAULT_ACCOUNT_ID,
+    refresh_daily_balances,
+    bump_data_version,
+    apply_rollup_delta,
+    transaction_filters
+)
+from snapshots import refresh_snapshots
+
+
+# ---------------- HELPERS ----------------
+# Every ledger write is one short DB transaction: the row change, the
+# monthly rollup delta and an atomic balance delta (amount = amount +
+# :delta) with its version bump commit or roll back together. The daily
+# balances and snapshots are derived from the committed rows afterwards,
+# from the earliest date written, in a transaction of their own, so a
+# backdated write does not hold the balance row locked while they are
+# recomputed. If that refresh fails, reconcile.py reports the drift and
+# --repair rebuilds it.
+REFRESH_LOCK_KEY = 7263042
+
+def signed_amount(t_type, amount):
+    if t_type == "income":
+        return float(amount)
+    if t_type == "expense":
+        return -float(amount)
+    return 0.0
+
+
+def _for_update():
+    # SQLite serializes writers on its own and has no FOR UPDATE
+    return " FOR UPDATE" if engine.dialect.name == "postgresql" else ""
+
+
+def apply_balance_delta(conn, delta, account_id=DEFAULT_ACCOUNT_ID):
+    balance = conn.execute(
+        text("UPDATE balance SET amount = amount + :delta WHERE id=:account_id RETURNING amount"),
+        {"delta": float(delta), "account_id": int(account_id)}
+    ).scalar()
+
+    if balance is None:
+        # rolls back the rows written for it
+        raise ValueError(f"Unknown account: {account_id}")
+
+    bump_data_version(conn, "transactions", "balance", accounts=[account_id])
+
+    return float(balance)
+
+
+def refresh_derived(from_dates):
+    # from_dates: {account id: earliest date written, None for all}. Runs
+    # after the write committed; on Postgres an advisory lock per account
+    # keeps two refreshes of one account from interleaving.
+    with write_transaction() as conn:
+        for account_id, from_date in sorted(from_dates.items()):
+            if engine.dialect.name == "postgresql":
+                conn.execute(
+                    text("SELECT pg_advisory_xact_lock(:key, :account_id)"),
+                    {"key": REFRESH_LOCK_KEY, "account_id": int(account_id)}
+                )
+
+            refresh_daily_balances(conn, from_date, account_id)
+            refresh_snapshots(conn, from_date, account_id)
+
+
+# ---------------- WRITES ----------------
+def add_transaction(t_date, t_type, category, amount, note="", account_id=DEFAULT_ACCOUNT_ID):
+    # stored in whole cents (see AMOUNTS in database.py); the deltas below
+    # use the same rounded value
+    amount = round(float(amount), 2)
+
+    with engine.begin() as conn:
+        new_id = conn.execute(
+            text("""
+            INSERT INTO transactions (account_id, date, type, category, amount, note)
+            VALUES (:account_id, :date, :type, :category, :amount, :note)
+            RETURNING id
+            """),
+            {
+                "account_id": int(account_id),
+                "date": str(t_date),
+                "type": t_type,
+                "category": category,
+                "amount": to_db_amount(amount),
+                "note": note
+            }
+        ).scalar()
+
+        apply_rollup_delta(conn, [(account_id, t_date, t_type, category, amount, 1)])
+        balance = apply_balance_delta(conn, signed_amount(t_type, amount), account_id)
+
+    refresh_derived({account_id: t_date})
+    return new_id, balance
+
+
+def _apply_deleted(conn, rows):
+    # rows: (account_id, date, type, amount, category) returned by a DELETE.
+    # One rollup upsert, then per account one net balance delta. Returns
+    # {account id: new balance} and {account id: earliest date deleted}.
+    apply_rollup_delta(conn, [
+        (account_id, t_date, t_type, category, amount, -1)
+        for account_id, t_date, t_type, amount, category in rows
+    ])
+
+    by_account = {}
+    for account_id, t_date, t_type, amount, _ in rows:
+        delta, first_date = by_account.get(account_id, (0.0, str(t_date)[:10]))
+        by_account[account_id] = (delta - signed_amount(t_type, amount), min(first_date, str(t_date)[:10]))
+
+    balances = {
+        account_id: apply_balance_delta(conn, delta, account_id)
+        for account_id, (delta, _) in by_account.items()
+    }
+    return balances, {account_id: first_date for account_id, (_, first_date) in by_account.items()}
+
+
+def delete_transactions(tx_ids):
+    # Returns (deleted rows, {account id: new balance}) for the accounts
+    # the rows belonged to; the balances are None when nothing was deleted.
+    ids = [int(tx_id) for tx_id in tx_ids]
+    if not ids:
+        return 0, None
+
+    with engine.begin() as conn:
+        rows = conn.execute(
+            text(
+                "DELETE FROM transactions WHERE id IN :ids "
+                f"RETURNING account_id, date, type, {amount_sql()}, category"
+            )
+            .bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids}
+        ).fetchall()
+
+        if not rows:
+            return 0, None
+
+        balances, from_dates = _apply_deleted(conn, rows)
+
+    refresh_derived(from_dates)
+    return len(rows), balances
+
+
+def delete_matching(start=None, end=None, t_type=None, category=None,
+                    min_amount=None, max_amount=None, account_id=None):
+    # Same filters as the transactions grid; at least one is required.
+    params = {}
+    conditions = transaction_filters(start, end, t_type, category, min_amount, max_amount, params,
+                                     account_id)
+
+    if not conditions:
+        raise ValueError("delete_matching needs at least one filter")
+
+    with engine.begin() as conn:
+        rows = conn.execute(
+            text(
+                "DELETE FROM transactions WHERE " + " AND ".join(conditions)
+                + f" RETURNING account_id, date, type, {amount_sql()}, category"
+            ),
+            params
+        ).fetchall()
+
+        if not rows:
+            return 0, None
+
+        balances, from_dates = _apply_deleted(conn, rows)
+
+    refresh_derived(from_dates)
+    return len(rows), balances
+
+
+def delete_transaction(tx_id):
+    # The new balance of the transaction's account
+    _, balances = delete_transactions([tx_id])
+    return next(iter(balances.values())) if balances else None
+
+
+def edit_transaction(tx_id, t_date, t_type, category, amount, note=""):
+    amount = round(float(amount), 2)
+
+    # The transaction stays in its account
+    with write_transaction() as conn:
+        old = conn.execute(
+            text(f"SELECT account_id, date, type, {amount_sql()}, category FROM transactions WHERE id=:id"
+                 + _for_update()),
+            {"id": int(tx_id)}
+        ).fetchone()
+
+        if old is None:
+            return None
+
+        # the content changed, so the import dedup hash no longer applies
+        conn.execute(
+            text("""
+            UPDATE transactions
+            SET date=:date, type=:type, category=:category, amount=:amount,
+                note=:note, content_hash=NULL
+            WHERE id=:id
+            """),
+            {
+                "id": int(tx_id),
+                "date": str(t_date),
+                "type": t_type,
+                "category": category,
+                "amount": to_db_amount(amount),
+                "note": note
+            }
+        )
+
+        account_id, old_date, old_type, old_amount, old_category = old
+
+        apply_rollup_delta(conn, [
+            (account_id, old_date, old_type, old_category, old_amount, -1),
+            (account_id, t_date, t_type, category, amount, 1)
+        ])
+
+        delta = signed_amount(t_type, amount) - signed_amount(old_type, old_amount)
+        balance = apply_balance_delta(conn, delta, account_id)
+
+    refresh_derived({account_id: min(str(old_date)[:10], str(t_date))})
+    return balance
+
+
+def override_balance(amount, account_id=DEFAULT_ACCOUNT_ID):
+    # Snapshots follow the transactions, not this row; reconcile.py reports
+    # the difference an override introduces.
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE balance SET amount=:amount WHERE id=:account_id"),
+            {"amount": float(amount), "account_id": int(account_id)}
+        )
+        bump_data_version(conn, "balance", accounts=[account_id])
+
+
+# ---------------- ACCOUNTS ----------------
+def create_account(name, opening_balance=0.0):
+    # A new account starts on the global starting date with no
+    # transactions: its balance and every snapshot are the opening balance.
+    with engine.begin() as conn:
+        # the id comes from the database (migration 11)
+        account_id = conn.execute(
+            text("""
+            INSERT INTO balance (name, opening_balance, amount)
+            VALUES (:name, :opening, :opening)
+            RETURNING id
+            """),
+            {"name": name.strip(), "opening": float(opening_balance)}
+        ).scalar()
+        bump_data_version(conn, "balance", accounts=[account_id])
+
+    refresh_derived({account_id: None})
+    return int(account_id)
+
+
+def set_opening_balance(account_id, opening_balance):
+    # Shifts the whole account, current balance included, by the change
+    with write_transaction() as conn:
+        old = conn.execute(
+            text("SELECT opening_balance FROM balance WHERE id=:id" + _for_update()),
+            {"id": int(account_id)}
+        ).fetchone()
+
+        if old is None:
+            raise ValueError(f"Unknown account: {account_id}")
+
+        conn.execute(
+            text("""
+            UPDATE balance
+            SET opening_balance=:opening, amount = amount + :delta
+            WHERE id=:id
+            """),
+            {
+                "id": int(account_id),
+                "opening": float(opening_balance),
+                "delta": float(opening_balance) - float(old[0] or 0)
+            }
+        )
+        bump_data_version(conn, "balance", accounts=[account_id])
+
+    refresh_derived({account_id: None})
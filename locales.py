@@ -0,0 +1,320 @@
+import os
+
+
+# Language used when the session has not picked one (?lang=... or sidebar)
+DEFAULT_LOCALE = os.getenv("APP_LOCALE", "en")
+
+LOCALE_NAMES = {
+    "en": "English",
+    "es": "Español",
+}
+
+MONTH_NAMES = {
+    "en": {
+        1: "January", 2: "February", 3: "March", 4: "April",
+        5: "May", 6: "June", 7: "July", 8: "August",
+        9: "September", 10: "October", 11: "November", 12: "December"
+    },
+    "es": {
+        1: "Enero", 2: "Febrero", 3: "Marzo", 4: "Abril",
+        5: "Mayo", 6: "Junio", 7: "Julio", 8: "Agosto",
+        9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre"
+    },
+}
+
+
+# ---------------- MESSAGES ----------------
+MESSAGES = {
+    "en": {
+        # login, title and sidebar
+        "login.title": "🔒 Protected NetWorth Tracker",
+        "login.password": "Enter password",
+        "login.button": "Login",
+        "login.welcome": "Welcome Sir 😈",
+        "login.wrong": "Wrong password.",
+        "app.title": "💰 NetWorth Tracker",
+        "menu.label": "📌 Menu",
+        "menu.dashboard": "Dashboard",
+        "menu.transactions": "Transactions",
+        "menu.timeline": "Timeline",
+        "menu.export": "Export",
+        "menu.settings": "Settings",
+        "menu.account": "🏦 Account",
+        "accounts.all": "All accounts",
+        "menu.language": "🌐 Language",
+        "menu.logout": "🚪 Logout",
+
+        # shared
+        "axis.date": "Date",
+        "axis.balance": "Balance (€)",
+        "axis.amount": "Amount (€)",
+        "type.expense": "expense",
+        "type.income": "income",
+        "no_transactions": "No transactions yet.",
+
+        # dashboard
+        "dashboard.title": "📊 Dashboard",
+        "dashboard.live": "💎 Net Worth (Live)",
+        "dashboard.networth_today": "💰 Net Worth Today",
+        "dashboard.income_all": "📈 Total Income (All Time)",
+        "dashboard.expense_all": "📉 Total Expenses (All Time)",
+        "dashboard.curve": "📉 Net Worth Curve (Daily)",
+        "dashboard.curve_title": "Net Worth Evolution (Daily)",
+        "dashboard.no_timeline": "No timeline data available yet.",
+        "dashboard.navigation": "📅 Month Navigation",
+        "dashboard.previous_month": "⬅️ Previous Month",
+        "dashboard.next_month": "Next Month ➡️",
+        "dashboard.select_year": "Select Year",
+        "dashboard.select_month": "Select Month",
+        "dashboard.display_mode": "📌 Display Mode",
+        "dashboard.choose_mode": "Choose display mode:",
+        "mode.daily": "Daily (Normal)",
+        "mode.cumulative_month": "Cumulative (Month)",
+        "mode.cumulative_year": "Cumulative (Year)",
+        "dashboard.show_balance": "Show balance curve (Net Worth)",
+        "dashboard.income_expenses": "📈 Income / Expenses",
+        "dashboard.metrics": "Metrics",
+        "dashboard.period_totals": "📌 Totals (Selected Period)",
+        "dashboard.income": "📈 Total Income",
+        "dashboard.expense": "📉 Total Expenses",
+        "dashboard.no_period_transactions": "No transactions in this selected period.",
+        "dashboard.by_category": "🍕 Expenses by Category (Selected Month)",
+        "dashboard.pie_title": "Expenses ({month} {year})",
+        "dashboard.no_month_expenses": "No expenses for this month.",
+        "dashboard.pie_month_only": "Pie chart available only for Month view.",
+        "dashboard.monthly": "📅 Monthly Income vs Expenses (All Time)",
+        "dashboard.monthly_title": "Monthly Income vs Expenses",
+
+        # transactions
+        "transactions.title": "🧾 Transactions",
+        "transactions.account": "Account",
+        "transactions.date": "Date",
+        "transactions.type": "Type",
+        "transactions.category": "Category",
+        "transactions.custom_category": "Custom category",
+        "transactions.amount": "Amount (€)",
+        "transactions.note": "Note (optional)",
+        "transactions.add": "➕ Add Transaction",
+        "transactions.added": "Transaction added! New balance: {balance:,.2f} €",
+        "transactions.import": "📥 Import CSV",
+        "transactions.import_file": "CSV file (date, amount, type, category, note)",
+        "transactions.import_button": "Import transactions",
+        "transactions.import_failed": "Import failed: {error}",
+        "transactions.imported": "{inserted} transactions imported, {skipped} duplicates skipped.",
+        "transactions.browse": "📋 Browse Transactions",
+        "transactions.no_match": "No transactions match these filters.",
+        "filter.from": "From",
+        "filter.to": "To",
+        "filter.type": "Type",
+        "filter.category": "Category",
+        "filter.all": "All",
+        "filter.min_amount": "Min amount (€)",
+        "filter.max_amount": "Max amount (€)",
+        "page.first": "⏮️ First",
+        "page.previous": "◀️ Previous",
+        "page.next": "Next ▶️",
+        "page.last": "Last ⏭️",
+        "transactions.delete": "🗑️ Delete Transactions (Auto reverse impact)",
+        "transactions.select_id": "Select Transaction IDs",
+        "transactions.delete_button": "Delete selected transactions",
+        "transactions.delete_matching_confirm": "Delete every transaction matching the filters, not only this page",
+        "transactions.delete_matching": "Delete all matching transactions",
+        "transactions.deleted": "{count} transactions deleted and balance corrected.",
+
+        # timeline
+        "timeline.title": "📈 Net Worth Evolution (Transaction-Based)",
+        "timeline.starting_balance": "📌 Current Starting Balance",
+        "timeline.starting_date": "📅 Current Starting Date",
+        "timeline.edit": "⚙️ Edit Timeline Starting Point",
+        "timeline.balance_input": "Starting Balance (€)",
+        "timeline.balance_per_account": "Starting balances are set per account: pick one in the sidebar.",
+        "timeline.date_input": "Starting Date",
+        "timeline.save": "💾 Save Starting Point",
+        "timeline.saved": "Starting point updated successfully!",
+        "timeline.no_data": "No timeline data available yet.",
+        "timeline.curve_title": "📈 Net Worth Curve (Daily)",
+        "timeline.data": "📋 Timeline Data",
+
+        # export
+        "export.title": "📤 Export Data",
+        "export.transactions": "⬇️ Download Transactions CSV",
+        "export.snapshots": "⬇️ Download Snapshots CSV",
+        "export.timeline": "⬇️ Download Timeline CSV",
+        "export.ready": "Export ready.",
+
+        # settings
+        "settings.title": "⚙️ Settings",
+        "settings.balance": "Main Balance (DB)",
+        "settings.override": "⚠️ Manual Balance Override",
+        "settings.balance_input": "Set Main Balance (€)",
+        "settings.update": "💾 Update Main Balance",
+        "settings.updated": "Balance updated!",
+        "settings.select_account": "Pick an account in the sidebar to override its balance.",
+        "settings.accounts": "🏦 Accounts",
+        "settings.account_name": "Account name",
+        "settings.account_opening": "Starting balance (€)",
+        "settings.add_account": "➕ Add Account",
+        "settings.account_name_required": "The account needs a name.",
+        "settings.account_added": "Account {name} added!",
+        "settings.reconcile": "🧮 Ledger Reconciliation",
+        "settings.check": "🔍 Check drift",
+        "settings.consistent": "Balance, snapshots, daily balances and the monthly rollup match the transactions.",
+        "settings.repair": "🛠️ Repair drift",
+        "settings.repaired": "{count} drifted rows repaired.",
+
+        # debug panel
+        "debug.title": "🐞 Debug: this rerun",
+        "debug.summary": "{total:.1f} ms in total, {queries} queries taking {query_ms:.1f} ms",
+        "debug.spans": "Sections and analytics functions",
+        "debug.queries": "Queries, slowest first",
+    },
+    "es": {
+        # login, title and sidebar
+        "login.title": "🔒 NetWorth Tracker Protegido",
+        "login.password": "Introduce la contraseña",
+        "login.button": "Iniciar sesión",
+        "login.welcome": "Bienvenido Sir 😈",
+        "login.wrong": "Contraseña incorrecta.",
+        "app.title": "💰 NetWorth Tracker",
+        "menu.label": "📌 Menú",
+        "menu.dashboard": "Panel",
+        "menu.transactions": "Transacciones",
+        "menu.timeline": "Evolución",
+        "menu.export": "Exportar",
+        "menu.settings": "Configuración",
+        "menu.account": "🏦 Cuenta",
+        "accounts.all": "Todas las cuentas",
+        "menu.language": "🌐 Idioma",
+        "menu.logout": "🚪 Cerrar sesión",
+
+        # shared
+        "axis.date": "Fecha",
+        "axis.balance": "Balance (€)",
+        "axis.amount": "Cantidad (€)",
+        "type.expense": "Gasto",
+        "type.income": "Ingreso",
+        "no_transactions": "Todavía no hay transacciones.",
+
+        # dashboard
+        "dashboard.title": "📊 Panel",
+        "dashboard.live": "💎 Patrimonio Neto (En Vivo)",
+        "dashboard.networth_today": "💰 Patrimonio Hoy",
+        "dashboard.income_all": "📈 Ingresos Totales (Histórico)",
+        "dashboard.expense_all": "📉 Gastos Totales (Histórico)",
+        "dashboard.curve": "📉 Curva del Patrimonio (Diaria)",
+        "dashboard.curve_title": "Evolución del Patrimonio Neto (Diario)",
+        "dashboard.no_timeline": "Todavía no hay datos de evolución.",
+        "dashboard.navigation": "📅 Navegación Mensual",
+        "dashboard.previous_month": "⬅️ Mes anterior",
+        "dashboard.next_month": "Mes siguiente ➡️",
+        "dashboard.select_year": "Seleccionar año",
+        "dashboard.select_month": "Seleccionar mes",
+        "dashboard.display_mode": "📌 Modo de Visualización",
+        "dashboard.choose_mode": "Selecciona el modo:",
+        "mode.daily": "Diario (Normal)",
+        "mode.cumulative_month": "Acumulado (Mes)",
+        "mode.cumulative_year": "Acumulado (Año)",
+        "dashboard.show_balance": "Mostrar curva de balance (Patrimonio Neto)",
+        "dashboard.income_expenses": "📈 Ingresos / Gastos",
+        "dashboard.metrics": "Métricas",
+        "dashboard.period_totals": "📌 Totales (Periodo Seleccionado)",
+        "dashboard.income": "📈 Ingresos Totales",
+        "dashboard.expense": "📉 Gastos Totales",
+        "dashboard.no_period_transactions": "No hay transacciones en este periodo.",
+        "dashboard.by_category": "🍕 Gastos por Categoría (Mes Seleccionado)",
+        "dashboard.pie_title": "Gastos ({month} {year})",
+        "dashboard.no_month_expenses": "No hay gastos este mes.",
+        "dashboard.pie_month_only": "El gráfico circular solo está disponible en modo Mes.",
+        "dashboard.monthly": "📅 Ingresos vs Gastos Mensuales (Histórico)",
+        "dashboard.monthly_title": "Ingresos vs Gastos Mensuales",
+
+        # transactions
+        "transactions.title": "🧾 Transacciones",
+        "transactions.account": "Cuenta",
+        "transactions.date": "Fecha",
+        "transactions.type": "Tipo",
+        "transactions.category": "Categoría",
+        "transactions.custom_category": "Categoría personalizada",
+        "transactions.amount": "Cantidad (€)",
+        "transactions.note": "Nota (opcional)",
+        "transactions.add": "➕ Agregar transacción",
+        "transactions.added": "Transacción agregada! Nuevo balance: {balance:,.2f} €",
+        "transactions.import": "📥 Importar CSV",
+        "transactions.import_file": "Archivo CSV (date, amount, type, category, note)",
+        "transactions.import_button": "Importar transacciones",
+        "transactions.import_failed": "Error en la importación: {error}",
+        "transactions.imported": "{inserted} transacciones importadas, {skipped} duplicadas omitidas.",
+        "transactions.browse": "📋 Explorar transacciones",
+        "transactions.no_match": "Ninguna transacción coincide con los filtros.",
+        "filter.from": "Desde",
+        "filter.to": "Hasta",
+        "filter.type": "Tipo",
+        "filter.category": "Categoría",
+        "filter.all": "Todos",
+        "filter.min_amount": "Importe mínimo (€)",
+        "filter.max_amount": "Importe máximo (€)",
+        "page.first": "⏮️ Primera",
+        "page.previous": "◀️ Anterior",
+        "page.next": "Siguiente ▶️",
+        "page.last": "Última ⏭️",
+        "transactions.delete": "🗑️ Eliminar transacciones (corrige balance automáticamente)",
+        "transactions.select_id": "Seleccionar IDs de transacción",
+        "transactions.delete_button": "Eliminar transacciones seleccionadas",
+        "transactions.delete_matching_confirm": "Eliminar todas las transacciones que coinciden con los filtros, no solo esta página",
+        "transactions.delete_matching": "Eliminar todas las coincidentes",
+        "transactions.deleted": "{count} transacciones eliminadas y balance corregido.",
+
+        # timeline
+        "timeline.title": "📈 Evolución del Patrimonio Neto (Basado en transacciones)",
+        "timeline.starting_balance": "📌 Balance Inicial Actual",
+        "timeline.starting_date": "📅 Fecha Inicial Actual",
+        "timeline.edit": "⚙️ Editar punto de inicio de la evolución",
+        "timeline.balance_input": "Balance Inicial (€)",
+        "timeline.balance_per_account": "El balance inicial es de cada cuenta: elige una en la barra lateral.",
+        "timeline.date_input": "Fecha Inicial",
+        "timeline.save": "💾 Guardar punto de inicio",
+        "timeline.saved": "Punto de inicio actualizado correctamente!",
+        "timeline.no_data": "No hay datos disponibles todavía.",
+        "timeline.curve_title": "📈 Curva del Patrimonio Neto (Diaria)",
+        "timeline.data": "📋 Datos de evolución",
+
+        # export
+        "export.title": "📤 Exportar Datos",
+        "export.transactions": "⬇️ Descargar Transacciones CSV",
+        "export.snapshots": "⬇️ Descargar Snapshots CSV",
+        "export.timeline": "⬇️ Descargar Timeline CSV",
+        "export.ready": "Exportación lista.",
+
+        # settings
+        "settings.title": "⚙️ Configuración",
+        "settings.balance": "Balance Principal (DB)",
+        "settings.override": "⚠️ Modificación Manual del Balance",
+        "settings.balance_input": "Actualizar Balance Principal (€)",
+        "settings.update": "💾 Guardar nuevo balance",
+        "settings.updated": "Balance actualizado!",
+        "settings.select_account": "Elige una cuenta en la barra lateral para corregir su balance.",
+        "settings.accounts": "🏦 Cuentas",
+        "settings.account_name": "Nombre de la cuenta",
+        "settings.account_opening": "Balance inicial (€)",
+        "settings.add_account": "➕ Añadir Cuenta",
+        "settings.account_name_required": "La cuenta necesita un nombre.",
+        "settings.account_added": "Cuenta {name} añadida!",
+        "settings.reconcile": "🧮 Conciliación del Libro",
+        "settings.check": "🔍 Comprobar desviaciones",
+        "settings.consistent": "El balance, los snapshots, los saldos diarios y el resumen mensual coinciden con las transacciones.",
+        "settings.repair": "🛠️ Corregir desviaciones",
+        "settings.repaired": "{count} filas corregidas.",
+
+        # debug panel
+        "debug.title": "🐞 Depuración: esta ejecución",
+        "debug.summary": "{total:.1f} ms en total, {queries} consultas que tardan {query_ms:.1f} ms",
+        "debug.spans": "Secciones y funciones de análisis",
+        "debug.queries": "Consultas, las más lentas primero",
+    },
+}
+
+
+def translate(lang, key, **values):
+    # Missing keys fall back to English, so a partial catalog still renders
+    text = MESSAGES.get(lang, {}).get(key) or MESSAGES["en"][key]
+    return text.format(**values) if values else text
@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import event
+
+
+# One JSON line per profiled rerun is appended here when set
+PROFILE_LOG = os.getenv("PROFILE_LOG", "")
+
+# Show the sidebar debug panel to every session (or per session: ?debug=1)
+PROFILE_PANEL = os.getenv("PROFILE_PANEL", "0") == "1"
+
+# Queries kept per run (the rest are only counted) and SQL text length
+PROFILE_MAX_QUERIES = int(os.getenv("PROFILE_MAX_QUERIES", "500"))
+PROFILE_SQL_CHARS = int(os.getenv("PROFILE_SQL_CHARS", "300"))
+
+# A Streamlit rerun (or fragment rerun) executes in one thread, so the run
+# being recorded is thread-local; threads without one record nothing.
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+# ---------------- RUNS ----------------
+def active():
+    return getattr(_local, "run", None)
+
+
+def start_run(name, **info):
+    _local.run = {
+        "name": name,
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "started": time.perf_counter(),
+        "info": info,
+        "spans": [],
+        "stack": [],
+        "queries": [],
+        "query_count": 0,
+        "query_ms": 0.0,
+    }
+
+
+def set_info(**info):
+    current = active()
+    if current is not None:
+        current["info"].update(info)
+
+
+def finish_run():
+    # The finished run as a plain dict (None without one), logged if enabled
+    current = active()
+    if current is None:
+        return None
+    _local.run = None
+
+    report = {
+        "ts": current["ts"],
+        "run": current["name"],
+        **current["info"],
+        "total_ms": round((time.perf_counter() - current["started"]) * 1000, 3),
+        "query_count": current["query_count"],
+        "query_ms": round(current["query_ms"], 3),
+        "spans": current["spans"],
+        "queries": current["queries"],
+    }
+
+    if PROFILE_LOG:
+        with _log_lock, open(PROFILE_LOG, "a") as f:
+            f.write(json.dumps(report, default=str) + "\n")
+
+    return report
+
+
+@contextmanager
+def profiled(name, enabled=True, **info):
+    # A run of its own (e.g. a fragment rerun), or a plain span when a run
+    # is already being recorded
+    if active() is not None:
+        with span(name) as record:
+            yield record
+        return
+
+    if not enabled:
+        yield {}
+        return
+
+    start_run(name, **info)
+    try:
+        with span(name) as record:
+            yield record
+    finally:
+        finish_run()
+
+
+# ---------------- SPANS ----------------
+@contextmanager
+def span(name):
+    # Wall time of the block plus the queries issued inside it; nested
+    # spans are recorded with their depth. Yields the record for note().
+    current = active()
+    if current is None:
+        yield {}
+        return
+
+    record = {
+        "name": name,
+        "depth": len(current["stack"]),
+        "ms": 0.0,
+        "queries": 0,
+        "query_ms": 0.0,
+    }
+    current["spans"].append(record)
+    current["stack"].append(record)
+
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["ms"] = round((time.perf_counter() - started) * 1000, 3)
+        record["query_ms"] = round(record["query_ms"], 3)
+        current["stack"].pop()
+
+
+def timed(name=None):
+    def decorator(func):
+        return span(name or func.__name__)(func)
+
+    return decorator
+
+
+def note(**values):
+    # Attach values (cache hit/miss, row count, ...) to the innermost span
+    current = active()
+    if current is not None and current["stack"]:
+        current["stack"][-1].update(values)
+
+
+# ---------------- SQL ----------------
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    if active() is not None:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    current = active()
+    started = conn.info.get("profile_started")
+    if current is None or not started:
+        return
+
+    elapsed = (time.perf_counter() - started.pop()) * 1000
+
+    current["query_count"] += 1
+    current["query_ms"] += elapsed
+    for record in current["stack"]:
+        record["queries"] += 1
+        record["query_ms"] += elapsed
+
+    if len(current["queries"]) < PROFILE_MAX_QUERIES:
+        query = {
+            "sql": " ".join(statement.split())[:PROFILE_SQL_CHARS],
+            "ms": round(elapsed, 3),
+            "executemany": executemany,
+            "span": current["stack"][-1]["name"] if current["stack"] else None,
+        }
+
+        # rowcount is only the affected rows of statements without a result
+        # set; rows a SELECT (or RETURNING) produces are not known until they
+        # are fetched, and the analytics spans note those via note(rows=...)
+        rowcount = cursor.rowcount
+        if cursor.description is None and rowcount is not None and rowcount >= 0:
+            query["rows"] = rowcount
+
+        current["queries"].append(query)
+
+
+def instrument_engine(engine):
+    # Costs one thread-local lookup per query while nothing is recorded
+    event.listen(engine, "before_cursor_execute", _query_started)
+    event.listen(engine, "after_cursor_execute", _query_finished)
@@ -0,0 +1,216 @@
+import sys
+import time
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import text
+
+from database import engine, init_db, amount_sql
+from analytics import refresh_daily_balances, refresh_monthly_rollup, bump_data_version, account_openings
+
+
+# Differences below half a cent are rounding noise, not drift
+DRIFT_TOLERANCE = 0.005
+
+REPORT_COLUMNS = ["source", "account_id", "date", "stored", "expected", "drift"]
+
+
+# ---------------- LEDGER ----------------
+def _ledger_balance(conn, account_id, starting_balance):
+    # Cumulative balance of one account per transaction day, computed from
+    # one GROUP BY. Every transaction counts, also those dated before the
+    # starting date (see the account model in analytics.py).
+    signed = "SUM(CASE WHEN type = 'income' THEN amount WHEN type = 'expense' THEN -amount ELSE 0 END)"
+    daily = pd.DataFrame(
+        conn.execute(text(f"""
+            SELECT date, {amount_sql(signed)} AS delta
+            FROM transactions
+            WHERE account_id = :account_id
+            GROUP BY date
+            ORDER BY date
+        """), {"account_id": account_id}).fetchall(),
+        columns=["date", "delta"]
+    )
+
+    daily["date"] = pd.to_datetime(daily["date"]).astype("datetime64[ns]")
+    daily["expected"] = starting_balance + daily["delta"].astype(float).cumsum()
+
+    return daily[["date", "expected"]]
+
+
+def _expected_at(stored, ledger, starting_balance, start_date):
+    # As-of join: the ledger balance on or before each stored date.
+    stored = stored.copy()
+    stored["date"] = pd.to_datetime(stored["date"]).astype("datetime64[ns]")
+    stored = stored[stored["date"] >= start_date].sort_values("date")
+
+    merged = pd.merge_asof(stored, ledger, on="date", direction="backward")
+    merged["expected"] = merged["expected"].fillna(starting_balance)
+    return merged
+
+
+def _drift_rows(source, frame):
+    frame = frame.assign(
+        source=source,
+        stored=frame["stored"].astype(float),
+        drift=frame["stored"].astype(float) - frame["expected"]
+    )
+    return frame[frame["drift"].abs() >= DRIFT_TOLERANCE][REPORT_COLUMNS]
+
+
+def _stored(conn, query, account_id):
+    return pd.DataFrame(
+        conn.execute(text(query), {"account_id": account_id}).fetchall(),
+        columns=["date", "stored"]
+    )
+
+
+def _account_drift(conn, account_id, starting_balance, start_date):
+    # The balance row, snapshots and daily_balances of one account.
+    # Returns the report rows and the balance the ledger implies.
+    ledger = _ledger_balance(conn, account_id, starting_balance)
+    final_balance = float(ledger["expected"].iloc[-1]) if not ledger.empty else starting_balance
+
+    stored_balance = conn.execute(
+        text("SELECT amount FROM balance WHERE id=:account_id"), {"account_id": account_id}
+    ).scalar()
+    balance = pd.DataFrame([{
+        "date": pd.Timestamp(date.today()),
+        "stored": float(stored_balance or 0),
+        "expected": final_balance
+    }])
+
+    snapshots = _expected_at(
+        _stored(conn, "SELECT date, networth FROM snapshots WHERE account_id=:account_id", account_id),
+        ledger, starting_balance, start_date
+    )
+    daily = _expected_at(
+        _stored(conn, "SELECT date, closing_balance FROM daily_balances WHERE account_id=:account_id",
+                account_id),
+        ledger, starting_balance, start_date
+    )
+
+    report = pd.concat([
+        _drift_rows("balance", balance.assign(account_id=account_id)),
+        _drift_rows("snapshots", snapshots.assign(account_id=account_id)),
+        _drift_rows("daily_balances", daily.assign(account_id=account_id))
+    ], ignore_index=True)
+
+    return report, final_balance
+
+
+def _rollup_drift(conn):
+    # monthly_rollup against a fresh GROUP BY; one row per drifted account,
+    # month and type, dated on the 1st of the month. Both sides are compared
+    # per (account, month, type). The fresh side groups by day in the order
+    # of the (account_id, date, type, amount) covering index, so no sort is
+    # needed, and the few thousand day rows are summed to months here.
+    key = ["account_id", "month", "type"]
+
+    stored = pd.DataFrame(
+        conn.execute(text("""
+            SELECT account_id, month, type, SUM(amount)
+            FROM monthly_rollup
+            GROUP BY account_id, month, type
+        """)).fetchall(),
+        columns=key + ["stored"]
+    )
+    expected = pd.DataFrame(
+        conn.execute(text(f"""
+            SELECT account_id, date, type, {amount_sql("SUM(amount)")}
+            FROM transactions
+            GROUP BY account_id, date, type
+        """)).fetchall(),
+        columns=["account_id", "date", "type", "expected"]
+    )
+    expected["month"] = expected["date"].astype(str).str[:7]
+    expected["expected"] = expected["expected"].astype(float)
+    expected = expected.groupby(key, as_index=False)["expected"].sum()
+
+    merged = stored.merge(expected, on=key, how="outer").fillna(0)
+    merged["stored"] = merged["stored"].astype(float)
+    merged["expected"] = merged["expected"].astype(float)
+    merged["date"] = pd.to_datetime(merged["month"] + "-01").astype("datetime64[ns]")
+
+    return merged[["account_id", "date", "stored", "expected"]]
+
+
+# ---------------- RECONCILE ----------------
+def reconcile(repair=False):
+    # Compares, per account, the balance row, every snapshot and every
+    # daily_balances row, plus the monthly rollup, with the values
+    # recomputed from transactions. Returns one report row per drifted
+    # account and date; with repair=True fixes them in one DB transaction.
+    with engine.begin() as conn:
+        starting_date = conn.execute(
+            text("SELECT value FROM settings WHERE key='starting_date'")
+        ).scalar()
+        start_date = pd.Timestamp(starting_date or str(date.today()))
+
+        reports = []
+        final_balances = {}
+
+        for account_id, starting_balance in account_openings(conn).items():
+            report, final_balance = _account_drift(conn, account_id, starting_balance, start_date)
+            reports.append(report)
+            final_balances[account_id] = final_balance
+
+        reports.append(_drift_rows("monthly_rollup", _rollup_drift(conn)))
+        report = pd.concat(reports, ignore_index=True)
+
+        if repair and not report.empty:
+            _repair(conn, report, final_balances)
+
+    report["date"] = report["date"].dt.strftime("%Y-%m-%d")
+    report["account_id"] = report["account_id"].astype(int)
+    return report.reset_index(drop=True)
+
+
+def _repair(conn, report, final_balances):
+    def drifted(source):
+        return report[report["source"] == source]
+
+    balances = drifted("balance")
+    if not balances.empty:
+        conn.execute(
+            text("UPDATE balance SET amount=:amount WHERE id=:account_id"),
+            [
+                {"account_id": int(account_id), "amount": final_balances[int(account_id)]}
+                for account_id in balances["account_id"]
+            ]
+        )
+
+    snapshots = drifted("snapshots")
+    if not snapshots.empty:
+        conn.execute(
+            text("UPDATE snapshots SET networth=:networth WHERE account_id=:account_id AND date=:date"),
+            [
+                {"account_id": int(account_id), "date": d.strftime("%Y-%m-%d"), "networth": float(v)}
+                for account_id, d, v in zip(snapshots["account_id"], snapshots["date"], snapshots["expected"])
+            ]
+        )
+
+    for account_id in set(drifted("daily_balances")["account_id"]):
+        refresh_daily_balances(conn, account_id=int(account_id))
+
+    if not drifted("monthly_rollup").empty:
+        refresh_monthly_rollup(conn)
+
+    accounts = {int(account_id) for account_id in report["account_id"]}
+    bump_data_version(conn, "balance", "snapshots", accounts=accounts)
+
+
+if __name__ == "__main__":
+    init_db()
+
+    repair = "--repair" in sys.argv[1:]
+    started = time.perf_counter()
+    report = reconcile(repair=repair)
+    elapsed = time.perf_counter() - started
+
+    if report.empty:
+        print(f"Ledger consistent ({elapsed:.3f}s).")
+    else:
+        print(report.to_string(index=False))
+        action = "repaired" if repair else "found"
+        print(f"{len(report)} drifted rows {action} ({elapsed:.3f}s).")
@@ -0,0 +1,130 @@
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import text
+
+from database import engine, init_db
+from analytics import bump_data_version, ensure_daily_balances, get_setting, account_openings
+
+
+# Rows per multi-row INSERT ... ON CONFLICT statement
+SNAPSHOT_UPSERT_CHUNK = 500
+
+
+# ---------------- SNAPSHOT ENGINE ----------------
+# A snapshot is an account's net worth at the end of a day, one row per
+# account and day from the starting date to today. Values are taken from
+# daily_balances (carried forward over days after the last transaction),
+# so callers must refresh daily_balances first, on the same connection.
+def refresh_snapshots(conn, from_date=None, account_id=None):
+    # One account, or every account when None
+    openings = account_openings(conn, account_id)
+
+    starting_date = conn.execute(
+        text("SELECT value FROM settings WHERE key='starting_date'")
+    ).scalar()
+    start_date = pd.Timestamp(starting_date or str(date.today()))
+    today = pd.Timestamp(date.today())
+
+    from_ts = start_date if from_date is None else max(pd.Timestamp(str(from_date)[:10]), start_date)
+
+    if from_ts > today:
+        return 0
+
+    written = sum(
+        _refresh_account_snapshots(conn, account, starting_balance, from_ts, today)
+        for account, starting_balance in openings.items()
+    )
+    bump_data_version(conn, "snapshots", accounts=openings)
+    return written
+
+
+def _refresh_account_snapshots(conn, account_id, starting_balance, from_ts, today):
+    params = {
+        "account_id": account_id,
+        "from_date": from_ts.strftime("%Y-%m-%d"),
+        "today": today.strftime("%Y-%m-%d")
+    }
+
+    opening = conn.execute(text("""
+        SELECT closing_balance FROM daily_balances
+        WHERE account_id = :account_id AND date < :from_date
+        ORDER BY date DESC
+        LIMIT 1
+    """), params).fetchone()
+
+    closing = pd.DataFrame(
+        conn.execute(text("""
+            SELECT date, closing_balance FROM daily_balances
+            WHERE account_id = :account_id AND date >= :from_date AND date <= :today
+        """), params).fetchall(),
+        columns=["date", "closing_balance"]
+    )
+
+    all_days = pd.date_range(start=from_ts, end=today, freq="D")
+
+    series = pd.Series(
+        closing["closing_balance"].astype(float).to_numpy(),
+        index=pd.to_datetime(closing["date"])
+    ).reindex(all_days).ffill()
+    series = series.fillna(float(opening[0]) if opening else starting_balance)
+
+    return _bulk_upsert(conn, account_id, all_days.strftime("%Y-%m-%d"), series.to_numpy())
+
+
+def _bulk_upsert(conn, account_id, dates, values):
+    # Multi-row VALUES in chunks: one statement per chunk on both SQLite and
+    # Postgres. Rows whose value did not change are left untouched.
+    written = 0
+
+    for start in range(0, len(dates), SNAPSHOT_UPSERT_CHUNK):
+        chunk_dates = dates[start:start + SNAPSHOT_UPSERT_CHUNK]
+        chunk_values = values[start:start + SNAPSHOT_UPSERT_CHUNK]
+
+        placeholders = ", ".join(f"(:account_id, :d{i}, :n{i})" for i in range(len(chunk_dates)))
+        params = {"account_id": account_id}
+        for i, (d, v) in enumerate(zip(chunk_dates, chunk_values)):
+            params[f"d{i}"] = d
+            params[f"n{i}"] = float(v)
+
+        result = conn.execute(text(f"""
+            INSERT INTO snapshots (account_id, date, networth)
+            VALUES {placeholders}
+            ON CONFLICT (account_id, date) DO UPDATE SET networth = excluded.networth
+            WHERE snapshots.networth IS NULL OR snapshots.networth <> excluded.networth
+        """), params)
+        written += max(result.rowcount, 0)
+
+    return written
+
+
+def rebuild_snapshots():
+    ensure_daily_balances()
+
+    with engine.begin() as conn:
+        return refresh_snapshots(conn)
+
+
+def ensure_snapshots():
+    # Fill any missing day, e.g. days without writes since the last one.
+    start_date = pd.Timestamp(get_setting("starting_date") or str(date.today()))
+    today = pd.Timestamp(date.today())
+
+    with engine.connect() as conn:
+        count = conn.execute(
+            text("SELECT COUNT(*) FROM snapshots WHERE date >= :start AND date <= :today"),
+            {"start": start_date.strftime("%Y-%m-%d"), "today": today.strftime("%Y-%m-%d")}
+        ).scalar()
+        accounts = len(account_openings(conn))
+
+    if count >= ((today - start_date).days + 1) * accounts:
+        return 0
+
+    return rebuild_snapshots()
+
+
+if __name__ == "__main__":
+    init_db()
+
+    written = rebuild_snapshots()
+    print(f"{written} snapshot rows written.")
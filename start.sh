@@ -1 +1,4 @@
-python3 -m streamlit run app.py --server.port 8502 --server.address 0.0.0.0
+python3 database.py maintain
+python3 snapshots.py
+python3 reconcile.py
+python3 -m streamlit run app.py --server.port 8502 --server.address 0.0.0.0
\ No newline at end of file